@@ -7,48 +7,146 @@ Created 15/05/2024
 
 import os
 import sys
-import json
+import mmap
 import time
-from dotenv import load_dotenv
+import importlib
+import orjson
+from functools import partial
+from pathlib import Path
 
-from PyQt6 import uic
 from PyQt6.QtWidgets import(
     QApplication,
     QMainWindow,
     QWidget
 )
-from PyQt6.QtNetwork import QNetworkAccessManager
+from PyQt6.QtCore import QThreadPool, QTimer, QUrl
+from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkReply
 
-from utils.window.page_base import BasePage
 from utils.window.controller_base import BaseController
+from utils.window.ui_loader import load_ui
+from utils.env_compile import load_env
 
-from authentication.register import RegisterPage, RegisterController
-from authentication.login import LoginPage, LoginController
-from projects.navigation import ProjectsNavigationPage, ProjectsNavigationController
-from projects.view import ProjectViewPage, ProjectViewController
+# Load the environment variables from .env, through its compiled module.
+load_env()
 
-load_dotenv()
+_UI_DIR = Path(__file__).resolve().parent / "ui"
+_MAIN_WINDOW_UI = str(_UI_DIR / "main_window.ui")
 
-CACHE_PATH = "cache.json"
+# The persistent copy of the cache, which is only written on logout and exit.
+PERSISTENT_CACHE_PATH = "cache.json"
 MIN_CACHE_SAVE_INTERVAL = 2
 
+# How long a request to the server can stall for before it is aborted, in ms.
+TRANSFER_TIMEOUT = 30000
+
+
+def _get_runtime_cache_path() -> str:
+    """
+    Get the path of the working copy of the cache, which is saved to frequently.
+
+    This is in the user's runtime directory where there is one (usually a RAM
+    backed tmpfs on Linux), or local app data on Windows. Otherwise it is the
+    persistent cache file itself.
+
+    Returns:
+        str: The path to the working cache file.
+    """
+    if sys.platform == "win32":
+        directory = os.environ.get("LOCALAPPDATA")
+        app_dir = "GanttStudent"
+    else:
+        directory = os.environ.get("XDG_RUNTIME_DIR")
+        app_dir = "ganttstudent"
+
+    if not directory or not os.path.isdir(directory):
+        return PERSISTENT_CACHE_PATH
+
+    try:
+        os.makedirs(os.path.join(directory, app_dir), exist_ok=True)
+    except OSError:
+        return PERSISTENT_CACHE_PATH
+    return os.path.join(directory, app_dir, "cache.json")
+
+CACHE_PATH = _get_runtime_cache_path()
+
+# The pages of the application, mapped to the module, page class and controller
+# class names. A page's module is only imported, and the page constructed, the
+# first time its controller is accessed. See MainWindow._initialise_page().
+PAGES = {
+    "register": ("authentication.register", "RegisterPage", "RegisterController"),
+    "login": ("authentication.login", "LoginPage", "LoginController"),
+    "navigation": ("projects.navigation", "ProjectsNavigationPage", "ProjectsNavigationController"),
+    "project_view": ("projects.view", "ProjectViewPage", "ProjectViewController"),
+}
+
 
 class ClientApplication():
     """The main client application."""
 
+    # __weakref__ is needed for Qt to hold bound methods of the application as slots.
+    __slots__ = ("app", "network_manager", "reply_callbacks", "main_window", "cache", "last_file_save", "cache_pool", "__weakref__")
+
     def __init__(self) -> None:
         """Class initialisation."""
         self.app = QApplication([])
 
         # Setup the manager to handle API calls to the server.
         self.network_manager = QNetworkAccessManager()
+        self.network_manager.setTransferTimeout(TRANSFER_TIMEOUT)
+        self._warm_up_connection()
 
-        # Setup the UI window.
-        self._setup_window()
+        # The callback of each reply still in flight, see BaseController._bind_reply().
+        # This also keeps the replies referenced until they have finished.
+        self.reply_callbacks = {}
+        self.network_manager.finished.connect(self._dispatch_reply)
 
         # When was the last time the cache was saved.
         self.last_file_save = 0
+        # Writes the cache in the background on logout. A single thread keeps
+        # the writes in order.
+        self.cache_pool = QThreadPool()
+        self.cache_pool.setMaxThreadCount(1)
+
+        # Setup and show the UI window straight away, then finish initialising
+        # once the event loop is running.
+        self._setup_window()
+        QTimer.singleShot(0, self._post_show_init)
 
+    def _warm_up_connection(self) -> None:
+        """
+        Start resolving and connecting to the server in the background, while
+        the window is being set up, so the first request does not have to wait
+        on DNS and the TCP/TLS handshake.
+        """
+        url = QUrl(os.environ["SERVER_ADDRESS"])
+        if url.scheme() == "https":
+            self.network_manager.connectToHostEncrypted(url.host(), url.port(443))
+        elif url.scheme() == "http":
+            self.network_manager.connectToHost(url.host(), url.port(80))
+
+    def _dispatch_reply(self, reply: QNetworkReply) -> None:
+        """
+        Call the callback bound to a reply from the server once it has finished,
+        then delete the reply.
+
+        Args:
+            reply (QNetworkReply): The reply object from the server.
+        """
+        callback = self.reply_callbacks.pop(reply, None)
+        try:
+            if callback is not None:
+                callback(reply)
+        finally:
+            # Every reply is deleted once it has been handled, including when
+            # it was an error.
+            reply.deleteLater()
+
+    def _post_show_init(self) -> None:
+        """
+        Load the user cache and show the first page. Runs on the first idle tick
+        after the main window is shown, so the window appears without waiting on
+        disk I/O.
+        """
         # Load the user cache.
         self.load_cache()
 
@@ -70,23 +168,77 @@ class ClientApplication():
     def load_cache(self):
         """
         Load the cache from the cache file.
+
+        The working copy is used if it exists, otherwise the persistent copy
+        (e.g. after a reboot has cleared the runtime directory).
         
         Handles the case where the cache file does not exist and creates it.
         """
-        if not os.path.exists(CACHE_PATH):
+        if os.path.exists(CACHE_PATH):
+            path = CACHE_PATH
+        elif os.path.exists(PERSISTENT_CACHE_PATH):
+            path = PERSISTENT_CACHE_PATH
+        else:
             # Create the cache file if it does not exist.
             return self._new_cache()
-        else:
-            # Otherwise load the cache from the file.
-            try:
-                with open(CACHE_PATH, "r") as file:
-                    self.cache = json.load(file)
-            except:
-                self._new_cache()
+
+        # Otherwise load the cache from the file.
+        try:
+            # Map the file into memory and parse it in place, rather than
+            # reading it into a separate buffer first.
+            with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as data:
+                    self.cache = orjson.loads(data)
+        except:
+            self._new_cache()
+
+    @staticmethod
+    def _write_cache_data(path: str, data: bytes) -> None:
+        """
+        Write the serialised cache to a file.
+
+        Args:
+            path (str): The path to the cache file.
+            data (bytes): The cache, serialised to JSON.
+        """
+        # Write to a temporary file and then replace the cache file with it,
+        # so the cache file is never left half written if the app crashes.
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+    def _write_cache(self, path: str) -> None:
+        """
+        Write the cache to a file.
+
+        Args:
+            path (str): The path to the cache file.
+        """
+        # Any write still in progress in the background would otherwise race
+        # with this one over the same file.
+        self.cache_pool.waitForDone()
+        self._write_cache_data(path, orjson.dumps(self.cache))
+
+    @staticmethod
+    def _persist_cache_data(data: bytes) -> None:
+        """
+        Write the serialised cache to the working and persistent cache files.
+        Runs on the cache thread.
+
+        Args:
+            data (bytes): The cache, serialised to JSON.
+        """
+        try:
+            ClientApplication._write_cache_data(CACHE_PATH, data)
+            if CACHE_PATH != PERSISTENT_CACHE_PATH:
+                ClientApplication._write_cache_data(PERSISTENT_CACHE_PATH, data)
+        except Exception as e:
+            print(f"Failed to save cache: {e}")
 
     def save_cache(self):
         """
-        Save the cache to the cache file.
+        Save the cache to the working cache file.
 
         Only saves the cache if the last save was more than MIN_CACHE_SAVE_INTERVAL seconds ago.
         """
@@ -94,12 +246,31 @@ class ClientApplication():
             # Do not save the cache if the last save was less than MIN_CACHE_SAVE_INTERVAL seconds ago.
             return
         try:
-            with open(CACHE_PATH, "w") as file:
-                json.dump(self.cache, file)
-                self.last_file_save = time.time()
+            self._write_cache(CACHE_PATH)
+            self.last_file_save = time.time()
+        except Exception as e:
+            print(f"Failed to save cache: {e}")
+
+    def persist_cache(self):
+        """Save the cache to the persistent cache file, regardless of when it was last saved."""
+        try:
+            self._write_cache(CACHE_PATH)
+            if CACHE_PATH != PERSISTENT_CACHE_PATH:
+                self._write_cache(PERSISTENT_CACHE_PATH)
+            self.last_file_save = time.time()
         except Exception as e:
             print(f"Failed to save cache: {e}")
 
+    def persist_cache_in_background(self) -> None:
+        """
+        Save the cache to the persistent cache file like .persist_cache(), but
+        write it on the cache thread so the GUI does not wait on the disk.
+        """
+        # Serialise the cache now, so later changes to it are not written.
+        data = orjson.dumps(self.cache)
+        self.last_file_save = time.time()
+        self.cache_pool.start(partial(self._persist_cache_data, data))
+
     def switch_to(self, page: QWidget) -> None:
         """
         Switch to the specified page.
@@ -117,7 +288,7 @@ class ClientApplication():
     def logout(self) -> None:
         """Log the user out, and return them to the login screen."""
         self.cache["access_token"] = None
-        self.save_cache()
+        self.persist_cache_in_background()
 
         # Return to login screen.
         self.main_window.login_controller.show()
@@ -130,6 +301,9 @@ class ClientApplication():
         """Run the application."""
         self.app.exec()
 
+        # Keep a persistent copy of the cache once the application has exited.
+        self.persist_cache()
+
         sys._excepthook = sys.excepthook 
         def exception_hook(exctype, value, traceback):
             print(exctype, value, traceback)
@@ -150,7 +324,7 @@ class MainWindow(QMainWindow):
         self._load_window()
 
         # Initialise the pages and controllers for the application.
-        self.controllers = self._initialise_widgets()
+        self._controllers = self._initialise_widgets()
     
     def _load_window(self) -> QMainWindow:
         """
@@ -159,7 +333,7 @@ class MainWindow(QMainWindow):
         Returns:
             QMainWindow: A QMainWindow object.
         """
-        return uic.load_ui.loadUi(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui\\main_window.ui"), self)
+        return load_ui(_MAIN_WINDOW_UI, self)
 
     def switch_to(self, page: QWidget) -> None:
         """
@@ -170,36 +344,77 @@ class MainWindow(QMainWindow):
         """
         self.stacked_widget.setCurrentWidget(page)
 
-    def _initialise_page(self, page: BasePage, controller: BaseController) -> None:
+    def _initialise_page(self, name: str) -> BaseController:
         """
-        Initialise a page and controller for the application.
+        Initialise a page and controller for the application, if it has not
+        been initialised already.
+
+        The controller properties only call this on first access, afterwards
+        they return the controller from self._controllers directly.
+
+        The page's module is imported here rather than at startup, so that only
+        the pages the user actually visits are paid for.
 
         Args:
-            page (BasePage): The page to initialise.
-            controller (BaseController): The controller to initialise.
-        """
-        page = page()
-        controller = controller(self.client, page)
-        page.assign_controller(controller)
-
-        # Add the page to the stacked widget so that it can be shown.
-        self.stacked_widget.addWidget(page)
-
-        return page, controller
-
-    def _initialise_widgets(self):
-        """Initialise the pages and controllers for the application."""
-        self.register_page, self.register_controller = self._initialise_page(RegisterPage, RegisterController)
-        self.login_page, self.login_controller = self._initialise_page(LoginPage, LoginController)
-        self.navigation_page, self.navigation_controller = self._initialise_page(ProjectsNavigationPage, ProjectsNavigationController)
-        self.project_view_page, self.project_view_controller = self._initialise_page(ProjectViewPage, ProjectViewController)
-
-        return (
-            self.register_controller,
-            self.login_controller,
-            self.navigation_controller,
-            self.project_view_controller,
-        )
+            name (str): The name of the page to initialise, as keyed in PAGES.
+
+        Returns:
+            BaseController: The controller of the page.
+        """
+        controller = self._controllers.get(name)
+        if controller is not None:
+            return controller
+
+        module_name, page_class_name, controller_class_name = PAGES[name]
+        module = importlib.import_module(module_name)
+
+        # Hold off repainting and signals from the stacked widget while the page
+        # is built and added, so that it only lays out and paints once.
+        stacked_widget = self.stacked_widget
+        stacked_widget.setUpdatesEnabled(False)
+        stacked_widget.blockSignals(True)
+        try:
+            page = getattr(module, page_class_name)()
+            controller = getattr(module, controller_class_name)(self.client, page)
+            page.assign_controller(controller)
+
+            # Add the page to the stacked widget so that it can be shown.
+            stacked_widget.addWidget(page)
+        finally:
+            stacked_widget.blockSignals(False)
+            stacked_widget.setUpdatesEnabled(True)
+
+        self._controllers[name] = controller
+        return controller
+
+    def _initialise_widgets(self) -> dict:
+        """
+        Initialise the pages and controllers for the application.
+
+        No pages are constructed here, they are constructed on first access of
+        their controller e.g. .login_controller.
+        """
+        return {}
+
+    @property
+    def register_controller(self) -> BaseController:
+        """The register page controller."""
+        return self._initialise_page("register")
+
+    @property
+    def login_controller(self) -> BaseController:
+        """The login page controller."""
+        return self._initialise_page("login")
+
+    @property
+    def navigation_controller(self) -> BaseController:
+        """The projects navigation page controller."""
+        return self._initialise_page("navigation")
+
+    @property
+    def project_view_controller(self) -> BaseController:
+        """The project view page controller."""
+        return self._initialise_page("project_view")
 
 def main():
     """Runtime."""
@@ -5,22 +5,39 @@ Login page and controller classes.
 Created 23/05/2024
 """
 
-import os
+from pathlib import Path
 
-from PyQt6.QtNetwork import QNetworkRequest, QNetworkReply, QNetworkReply
-from PyQt6.QtCore import QUrl, Qt
+from PyQt6.QtNetwork import QNetworkReply
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QCursor
 
 from utils.window.page_base import BasePage
 from utils.window.controller_base import BaseController
-from utils.server_response import get_json_from_reply, to_json_data
+from utils.window.ui_loader import preload_ui
+from utils.server_response import get_json_from_reply, to_json_data, create_endpoint
+
+_UI_DIR = Path(__file__).resolve().parent / "ui"
+
+# The error message for network errors that have no specific message, only
+# formatted when it is actually needed.
+_UNEXPECTED_TEMPLATE = "An unexpected error of type {name}. Please try again later."
+
+# The endpoint is constant for the whole process, so build it once.
+_LOGIN_ENDPOINT = create_endpoint("/user/authorise")
 
 
 class LoginPage(BasePage):
-    ui_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui\\login_page.ui")
+    ui_path = str(_UI_DIR / "login_page.ui")
 
 class LoginController(BaseController):
     """Login controller class."""
+
+    # The error messages to display for each network error from a login request.
+    _ERROR_MESSAGES = {
+        QNetworkReply.NetworkError.InternalServerError: "The server has experienced an unexpected error.",
+        QNetworkReply.NetworkError.AuthenticationRequiredError: "Invalid username or password.",
+        QNetworkReply.NetworkError.ContentNotFoundError: "Invalid username or password.",
+    }
     
     def __init__(self, *args, **kwargs) -> None:
         """Class initialisation."""
@@ -28,9 +45,7 @@ class LoginController(BaseController):
         self._view.error_frame.hide()
 
     def _setup_endpoints(self) -> None:
-        self._login_endpoint = QNetworkRequest()
-        self._login_endpoint.setUrl(QUrl(f"{os.getenv('SERVER_ADDRESS')}/user/authorise"))
-        self._login_endpoint.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
+        self._login_endpoint = _LOGIN_ENDPOINT
 
     def display_error(self, message: str) -> None:
         """
@@ -60,8 +75,6 @@ class LoginController(BaseController):
 
         self._client.main_window.navigation_controller.show()
         
-        reply.deleteLater()
-        
     def _handle_login_error(self, reply: QNetworkReply, error: QNetworkReply.NetworkError) -> None:
         """
         A callback function for handling errors that occur from the login request.
@@ -71,18 +84,15 @@ class LoginController(BaseController):
             error (QNetworkReply.NetworkError): The network error object from the
                 reply.
         """
-        if error is QNetworkReply.NetworkError.ContentConflictError:
-            self.display_error("Username already exists. Please choose a different username.")
-        elif error is QNetworkReply.NetworkError.ProtocolInvalidOperationError:
-            self.display_error(get_json_from_reply(reply)["message"])
-        elif error is QNetworkReply.NetworkError.InternalServerError:
-            self.display_error("The server has experienced an unexpected error.")
-        elif error is QNetworkReply.NetworkError.AuthenticationRequiredError:
-            self.display_error("Invalid username or password.")
-        elif error is QNetworkReply.NetworkError.ContentNotFoundError:
-            self.display_error("Invalid username or password.")
+        if error == QNetworkReply.NetworkError.ProtocolInvalidOperationError:
+            # The server includes the reason for the error in the response.
+            message = get_json_from_reply(reply)["message"]
         else:
-            self.display_error(f"An unexpected error of type {error.name}. Please try again later.")
+            message = self._ERROR_MESSAGES.get(error)
+            if message is None:
+                message = _UNEXPECTED_TEMPLATE.format(name=error.name)
+
+        self.display_error(message)
 
     def login(self, username: str, password: str) -> None:
         """
@@ -103,7 +113,7 @@ class LoginController(BaseController):
                 }
             )
         )
-        reply.finished.connect(lambda: self._on_login_completion(reply))
+        self._bind_reply(reply, self._on_login_completion)
 
     def _on_login(self) -> None:
         """
@@ -118,6 +128,26 @@ class LoginController(BaseController):
 
         self.login(self._view.username_field.text(), self._view.password_field.text())
 
+    def show(self) -> None:
+        """
+        Show the login screen.
+
+        Once it has been shown, the navigation page is prepared in the
+        background while the user logs in.
+        """
+        super().show()
+        QTimer.singleShot(0, self._preload_navigation)
+
+    def _preload_navigation(self) -> None:
+        """
+        Import the navigation page and load its form classes, so that switching
+        to it after logging in does not have to.
+        """
+        # Imported here, as the navigation page is otherwise only imported once
+        # the user has logged in.
+        from projects.navigation import ProjectsNavigationPage, ProjectViewItem
+        preload_ui(ProjectsNavigationPage.ui_path, ProjectViewItem.ui_path)
+
     def _switch_to_register(self) -> None:
         """
         Switches to the register page.
@@ -133,7 +163,6 @@ class LoginController(BaseController):
         # Set error label to wrap text.
         self._view.error_label.setWordWrap(True)
 
-
         # Switch to register screen.
         self._view.register_label.clicked.connect(self._switch_to_register)
         self._view.register_label.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
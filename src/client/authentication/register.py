@@ -5,20 +5,29 @@ Register page and controller module.
 Created 18/05/2024
 """
 
-import os
+from pathlib import Path
 
-from PyQt6.QtNetwork import QNetworkRequest, QNetworkReply, QNetworkReply
-from PyQt6.QtCore import QUrl, Qt
+from PyQt6.QtNetwork import QNetworkReply
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QCursor
 
 from utils.window.page_base import BasePage
 from utils.window.controller_base import BaseController
-from utils.server_response import get_json_from_reply, to_json_data
+from utils.server_response import get_json_from_reply, to_json_data, create_endpoint
 from utils.dialog import create_message_dialog
 
+_UI_DIR = Path(__file__).resolve().parent / "ui"
+
+# The endpoint is constant for the whole process, so build it once.
+_REGISTER_ENDPOINT = create_endpoint("/user/register")
+
+# How long to wait after the last keystroke in either password field before
+# checking that they match, in ms.
+PASSWORD_CHECK_INTERVAL = 120
+
 
 class RegisterPage(BasePage):
-    ui_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui\\register_page.ui")
+    ui_path = str(_UI_DIR / "register_page.ui")
 
 class RegisterController(BaseController):
     """Registration controller class."""
@@ -29,9 +38,7 @@ class RegisterController(BaseController):
         self._view.error_frame.hide()
 
     def _setup_endpoints(self) -> None:
-        self._register_endpoint = QNetworkRequest()
-        self._register_endpoint.setUrl(QUrl(f"{os.getenv('SERVER_ADDRESS')}/user/register"))
-        self._register_endpoint.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
+        self._register_endpoint = _REGISTER_ENDPOINT
 
     def display_error(self, message: str) -> None:
         """
@@ -40,7 +47,9 @@ class RegisterController(BaseController):
         Args:
             message (str): The error message to display.
         """
-        self._view.error_label.setText(message)
+        # Only set the text when it has changed, as this re-lays out the label.
+        if self._view.error_label.text() != message:
+            self._view.error_label.setText(message)
         self._view.error_frame.show()
 
     def _on_register_completion(self, reply: QNetworkReply) -> None:
@@ -54,8 +63,6 @@ class RegisterController(BaseController):
         if reply.error() != QNetworkReply.NetworkError.NoError:
             return self._handle_register_error(reply, reply.error())
         
-        reply.deleteLater()
-
         create_message_dialog(self._view, "Success", "Registration successful. Please log in.").exec()
 
         self._switch_to_login()
@@ -98,7 +105,7 @@ class RegisterController(BaseController):
                 }
             )
         )
-        reply.finished.connect(lambda: self._on_register_completion(reply))
+        self._bind_reply(reply, self._on_register_completion)
 
     def _on_register(self) -> None:
         """
@@ -106,7 +113,9 @@ class RegisterController(BaseController):
         """
         # Do not proceed if the password fields are not the same.
         if self.is_password_same() is False:
-            # Display error message is already handled by ._check_password_confirmation()
+            # Display the error now, rather than waiting on the pending check.
+            self._password_check_timer.stop()
+            self._check_password_confirmation()
             return
         elif self._view.username_field.text() == "" or self._view.password_field.text() == "":
             self.display_error("Username and password fields cannot be empty.")
@@ -153,9 +162,14 @@ class RegisterController(BaseController):
         self._view.password_field.returnPressed.connect(self._on_register)
         self._view.password_confirm_field.returnPressed.connect(self._on_register)
         
-        # Bind password confirmation check.
-        self._view.password_field.textChanged.connect(self._check_password_confirmation)
-        self._view.password_confirm_field.textChanged.connect(self._check_password_confirmation)
+        # Bind password confirmation check, only checking once the user has
+        # stopped typing.
+        self._password_check_timer = QTimer(self._view)
+        self._password_check_timer.setSingleShot(True)
+        self._password_check_timer.setInterval(PASSWORD_CHECK_INTERVAL)
+        self._password_check_timer.timeout.connect(self._check_password_confirmation)
+        self._view.password_field.textChanged.connect(self._password_check_timer.start)
+        self._view.password_confirm_field.textChanged.connect(self._password_check_timer.start)
 
         # Set error label to wrap text.
         self._view.error_label.setWordWrap(True)
@@ -7,71 +7,131 @@ Created 30/05/2024
 
 import os
 import json
-
-from PyQt6 import uic
-from PyQt6.QtNetwork import QNetworkRequest, QNetworkReply, QNetworkReply
-from PyQt6.QtCore import QUrl, Qt
-from PyQt6.QtGui import QAction, QImage, QPixmap
+from typing import Callable
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+
+from PyQt6.QtCore import Qt, QObject, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtNetwork import QNetworkReply
+from PyQt6.QtGui import QImage, QPixmap
 from PyQt6.QtWidgets import QWidget, QMenuBar, QGridLayout
 
 from utils.window.page_base import BasePage
+from utils.window.ui_loader import load_ui
 from utils.window.controller_base import BaseController
-from utils.server_response import get_json_from_reply, to_json_data, handle_new_response_payload
+from utils.server_response import get_json_from_reply, to_json_data, handle_new_response_payload, create_endpoint
 from utils.dialog import create_message_dialog, create_text_input_dialog
 
-from projects.view.export import export_project
+_UI_DIR = Path(__file__).resolve().parent / "ui"
+
+# The endpoints are constant for the whole process, so build them once.
+_NEW_PROJECT_ENDPOINT = create_endpoint("/project/new-project")
+_DELETE_PROJECT_ENDPOINT = create_endpoint("/project/delete-project")
+_FETCH_PROJECTS_ENDPOINT = create_endpoint("/project/fetch-user-projects")
+_RENAME_PROJECT_ENDPOINT = create_endpoint("/project/rename-project")
+_FETCH_PREVIEWS_ENDPOINT = create_endpoint("/project/task/fetch-previews")
 
 PROJECTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "user_projects")
+# A single file holding the data of every project, keyed by uuid.
+MANIFEST_PATH = os.path.join(PROJECTS_DIR, "manifest.json")
 MAX_PROJECTS_COLUMNS = 3
+# How long to wait after the last keystroke in the search field before
+# filtering the projects, in ms.
+SEARCH_DEBOUNCE_INTERVAL = 150
+# How many new project tiles are created at a time, before letting the event
+# loop paint them and handle input.
+TILE_BATCH_SIZE = 12
+
+# Rendered project previews, keyed by (uuid, updated_at) so that a preview is
+# only rendered again once its project changes. Least recently used first.
+_PREVIEW_CACHE: OrderedDict[tuple[str, float], QPixmap] = OrderedDict()
+PREVIEW_CACHE_SIZE = 64
 
 
 class ProjectsNavigationPage(BasePage):
-    ui_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui\\projects_navigation_page.ui")
+    ui_path = str(_UI_DIR / "projects_navigation_page.ui")
 
     def _load_ui(self) -> QWidget:
-        widget = super()._load_ui()
+        widget = BasePage._load_ui(self)
 
         self.menu_bar = QMenuBar(widget)
         
         self.file_menu = self.menu_bar.addMenu('&File')
 
-        self.logout_action = QAction()
-        self.logout_action.setText('Log out')
-        self.file_menu.addAction(self.logout_action)
-        
-        self.exit_action = QAction()
-        self.exit_action.setText('Exit')
-        self.file_menu.addAction(self.exit_action)
+        # The menu creates and owns each action.
+        self.logout_action = self.file_menu.addAction('Log out')
+        self.exit_action = self.file_menu.addAction('Exit')
 
         return widget
+
+class PreviewSignals(QObject):
+    """
+    Signals for the project previews rendered on the render thread.
+
+    These are owned by the controller rather than the project tiles, as a tile
+    may be deleted while its preview is being rendered.
+    """
+
+    # Signal for when a preview has been rendered, with the project's uuid, the
+    # updated_at it was rendered from and the image.
+    preview_rendered = pyqtSignal(str, object, QImage)
+    # Signal for when a preview could not be rendered, with the project's uuid
+    # and the updated_at it was to be rendered from.
+    preview_failed = pyqtSignal(str, object)
+
 class ProjectsNavigationController(BaseController):
     """Projects navigation controller class."""
-    
-    # Search query
-    query = ''
+
+    __slots__ = (
+        "query", "projects", "_names_lower", "_manifest", "_io_pool", "_render_pool",
+        "_item_by_uuid", "_pending_task_fetches", "_fetching_projects", "_refetch_projects",
+        "_new_project", "_delete_project", "_fetch_projects_endpoint", "_rename_project",
+        "_fetch_previews_endpoint", "_search_timer", "_render_timer", "_preview_signals",
+        "_render_matches", "_render_index",
+    )
 
     def __init__(self, *args, **kwargs) -> None:
         """Class initialisation."""
         super().__init__(*args, **kwargs)
 
+        # Search query
+        self.query = ''
         self.projects = {}
+        # The lowercased name of each project, for matching the search query.
+        self._names_lower: dict[str, str] = {}
+        # The projects as last saved to the manifest, read once here and then
+        # kept in memory.
+        self._manifest = self._load_manifest()
+        # Writes the manifest in the background, so the GUI thread does not wait
+        # on the disk. A single thread keeps the writes in order.
+        self._io_pool = QThreadPool()
+        self._io_pool.setMaxThreadCount(1)
+        # Renders the project previews in the background. Only one is rendered
+        # at a time, as the fonts used to render them are shared.
+        self._render_pool = QThreadPool()
+        self._render_pool.setMaxThreadCount(1)
+        # The project tiles, by project uuid. Tiles are kept and reused when the
+        # page is shown again, and only deleted once their project is.
+        self._item_by_uuid: dict[str, ProjectViewItem] = {}
+        # The callbacks waiting on each project's tasks, which are fetched
+        # together in the next batch. See .fetch_tasks().
+        self._pending_task_fetches: dict[str, list[Callable[[dict], None]]] = {}
+        # Whether projects are being fetched, and whether they need to be
+        # fetched again once that has finished. See .fetch_projects().
+        self._fetching_projects = False
+        self._refetch_projects = False
+        # The projects being rendered, and how many of them have been placed so
+        # far. See .render_projects().
+        self._render_matches: list[tuple[str, dict]] = []
+        self._render_index = 0
 
     def _setup_endpoints(self) -> None:
-        self._new_project = QNetworkRequest()
-        self._new_project.setUrl(QUrl(f"{os.getenv('SERVER_ADDRESS')}/project/new-project"))
-        self._new_project.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
-
-        self._delete_project = QNetworkRequest()
-        self._delete_project.setUrl(QUrl(f"{os.getenv('SERVER_ADDRESS')}/project/delete-project"))
-        self._delete_project.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
-
-        self._fetch_projects_endpoint = QNetworkRequest()
-        self._fetch_projects_endpoint.setUrl(QUrl(f"{os.getenv('SERVER_ADDRESS')}/project/fetch-user-projects"))
-        self._fetch_projects_endpoint.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
-
-        self._rename_project = QNetworkRequest()
-        self._rename_project.setUrl(QUrl(f"{os.getenv('SERVER_ADDRESS')}/project/rename-project"))
-        self._rename_project.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
+        self._new_project = _NEW_PROJECT_ENDPOINT
+        self._delete_project = _DELETE_PROJECT_ENDPOINT
+        self._fetch_projects_endpoint = _FETCH_PROJECTS_ENDPOINT
+        self._rename_project = _RENAME_PROJECT_ENDPOINT
+        self._fetch_previews_endpoint = _FETCH_PREVIEWS_ENDPOINT
 
     def _on_rename_project_response(self, reply: QNetworkReply) -> None:
         """
@@ -84,8 +144,6 @@ class ProjectsNavigationController(BaseController):
         if reply.error() != QNetworkReply.NetworkError.NoError:
             return self._handle_error(reply, reply.error())
         
-        reply.deleteLater()
-
         payload = get_json_from_reply(reply)
         handle_new_response_payload(self._client, payload)
         self.fetch_projects()
@@ -108,7 +166,7 @@ class ProjectsNavigationController(BaseController):
                 }
             )
         )
-        reply.finished.connect(lambda: self._on_rename_project_response(reply))
+        self._bind_reply(reply, self._on_rename_project_response)
 
     def _on_delete_project_response(self, reply: QNetworkReply) -> None:
         """
@@ -121,8 +179,6 @@ class ProjectsNavigationController(BaseController):
         if reply.error() != QNetworkReply.NetworkError.NoError:
             return self._handle_error(reply, reply.error())
         
-        reply.deleteLater()
-
         payload = get_json_from_reply(reply)
         handle_new_response_payload(self._client, payload)
         self.fetch_projects()
@@ -143,7 +199,7 @@ class ProjectsNavigationController(BaseController):
                 }
             )
         )
-        reply.finished.connect(lambda: self._on_delete_project_response(reply))
+        self._bind_reply(reply, self._on_delete_project_response)
 
     def render_projects(self) -> None:
         """
@@ -151,34 +207,115 @@ class ProjectsNavigationController(BaseController):
 
         Takes into account of what the .query attribute is set to, and displays
         the relevant projects accordingly.
+
+        Only up to TILE_BATCH_SIZE new tiles are created per call, and the rest
+        are rendered on the next pass of the event loop, so the first tiles are
+        painted without waiting for every project's tile to be created. See
+        ._render_project_batch().
         """
-        projects = self.projects.copy()
-        omitted = []
-        for uuid, project_data in projects.items():
-            if self.query.lower() not in project_data["name"].lower():
-                omitted.append(uuid)
-        for uuid in omitted:
-            projects.pop(uuid)
-            item = self._view.scroll_body.findChild(QWidget, uuid)
-            if item:
-                self._view.scroll_body.layout().removeWidget(item)
-                item.deleteLater()
-        
-        sorted_projects = sorted(projects.items(), key=lambda x: x[1]["updated_at"], reverse=True)
+        # The projects matching the search query, most recently updated first.
+        query = self.query.lower()
+        matches = [(uuid, project_data) for uuid, project_data in self.projects.items() if query in self._names_lower[uuid]]
+        matches.sort(key=lambda x: x[1]["updated_at"], reverse=True)
+        self._render_matches = matches
+        self._render_index = 0
 
+        # Take every tile out of the grid, as they may all be in different
+        # places now. Tiles are only shown again once they are placed.
         layout: QGridLayout = self._view.scroll_body.layout()
-        for i, (uuid, project_data) in enumerate(sorted_projects):
-            row, column = divmod(i, MAX_PROJECTS_COLUMNS)
-            item = self._view.scroll_body.findChild(QWidget, uuid)
-            if item:
-                layout.removeWidget(item)
+        for item in self._item_by_uuid.values():
+            layout.removeWidget(item)
+
+        self._render_project_batch()
+
+    def _render_project_batch(self) -> None:
+        """
+        Place the next tiles in the grid, carrying on from where the last batch
+        stopped, until TILE_BATCH_SIZE new tiles have been created. See
+        .render_projects().
+        """
+        matches = self._render_matches
+
+        # Hold off repainting the grid while the tiles are moved around, so that
+        # it is only laid out and painted once.
+        scroll_body = self._view.scroll_body
+        scroll_body.setUpdatesEnabled(False)
+        try:
+            layout: QGridLayout = scroll_body.layout()
+            created = 0
+            index = self._render_index
+            while index < len(matches):
+                uuid, project_data = matches[index]
+                row, column = divmod(index, MAX_PROJECTS_COLUMNS)
+                item = self._item_by_uuid.get(uuid)
+                if item:
+                    item.update_from(project_data)
+                elif created == TILE_BATCH_SIZE:
+                    # Render the rest once this batch has been painted.
+                    self._render_timer.start()
+                    break
+                else:
+                    created += 1
+                    item = ProjectViewItem(self, project_data["name"], project_data["_id"])
+                    self._item_by_uuid[uuid] = item
+                    layout.setRowMinimumHeight(row, 300)
                 layout.addWidget(item, row, column)
                 item.show()
-                continue
-                
-            item = ProjectViewItem(self, project_data["name"], project_data["_id"])
-            layout.setRowMinimumHeight(row, 300)
-            layout.addWidget(item, row, column)
+                index += 1
+
+            if self._render_index == 0:
+                # Hide rather than delete the tiles that do not match (or are
+                # not reached in this batch), as they will likely be shown
+                # again.
+                placed = {uuid for uuid, _ in matches[:index]}
+                for uuid, item in self._item_by_uuid.items():
+                    if uuid not in placed:
+                        item.hide()
+            self._render_index = index
+
+            # Lay out the grid once, now that the tiles are in place.
+            layout.activate()
+        finally:
+            scroll_body.setUpdatesEnabled(True)
+
+    def _load_manifest(self) -> dict:
+        """
+        Load the projects saved on the local machine from the manifest file.
+
+        Returns:
+            dict: The projects, keyed by uuid.
+        """
+        os.makedirs(PROJECTS_DIR, exist_ok=True)
+        try:
+            with open(MANIFEST_PATH, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Failed to load the projects manifest: {e}")
+            return {}
+
+    @staticmethod
+    def _write_manifest(projects: dict) -> None:
+        """
+        Write the projects to the manifest file. Runs on the I/O thread.
+
+        Args:
+            projects (dict): The projects, keyed by uuid.
+        """
+        # Write to a temporary file first, so the manifest is never left half
+        # written if the app exits mid-write.
+        temp_path = MANIFEST_PATH + ".tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(projects, f, separators=(",", ":"))
+            os.replace(temp_path, MANIFEST_PATH)
+        except Exception as e:
+            print(f"Failed to save the projects manifest: {e}")
+
+    def _save_manifest(self) -> None:
+        """Save the projects on the local machine to the manifest file, in the background."""
+        self._io_pool.start(partial(self._write_manifest, self._manifest))
 
     def _reconciliate_projects(self, server_projects: dict) -> None:
         """
@@ -195,39 +332,23 @@ class ProjectsNavigationController(BaseController):
             server_projects (dict): A dictionary of projects from the server.
         """
         server_projects = server_projects or {}
-        self.projects = {}
-        
-        for file in os.listdir(PROJECTS_DIR):
-            if not file.endswith(".json"):
-                print(f"Skipping {file}")
-                continue
-
-            with open(os.path.join(PROJECTS_DIR, file), "r") as f:
-                project_data = json.load(f)
-                self.projects[project_data["_id"]] = project_data
-
-        deleted = []
-        for uuid, project_data in self.projects.items():
-            if not uuid in server_projects.keys():
-                try:
-                    os.remove(os.path.join(PROJECTS_DIR, f"{uuid}.json"))
-                except:
-                    print(f"Failed to delete {uuid}")
 
-                item = self._view.scroll_body.findChild(QWidget, uuid)
-                if item:
-                    self._view.scroll_body.layout().removeWidget(item)
-                    item.deleteLater()
-            
-                deleted.append(uuid)
-        
-        for uuid in deleted:
-            self.projects.pop(uuid)
+        for uuid in self._manifest.keys() - server_projects.keys():
+            item = self._item_by_uuid.pop(uuid, None)
+            if item:
+                self._view.scroll_body.layout().removeWidget(item)
+                item.deleteLater()
 
-        for uuid, project_data in server_projects.items():
-            with open(os.path.join(PROJECTS_DIR, f"{uuid}.json"), "w") as f:
-                json.dump(project_data, f, indent=4)
-            self.projects[uuid] = project_data
+        # Forget the previews of projects that no longer exist.
+        for key in [key for key in _PREVIEW_CACHE if key[0] not in server_projects]:
+            del _PREVIEW_CACHE[key]
+
+        # Only write the manifest when the projects have actually changed.
+        if server_projects != self._manifest:
+            self._manifest = server_projects
+            self._save_manifest()
+        self.projects = dict(self._manifest)
+        self._names_lower = {uuid: project_data["name"].lower() for uuid, project_data in self.projects.items()}
 
         self.render_projects()
 
@@ -238,12 +359,17 @@ class ProjectsNavigationController(BaseController):
         Args:
             reply (QNetworkReply): The reply object from the server.
         """
+        self._fetching_projects = False
+        if self._refetch_projects:
+            # The projects were changed while they were being fetched, so fetch
+            # them again, once, for the latest version.
+            self._refetch_projects = False
+            self.fetch_projects()
+
         # Do not proceed if there was an error.
         if reply.error() != QNetworkReply.NetworkError.NoError:
             return self._handle_error(reply, reply.error())
         
-        reply.deleteLater()
-
         payload = get_json_from_reply(reply)
         handle_new_response_payload(self._client, payload)
         self._reconciliate_projects(payload["projects"])
@@ -251,7 +377,16 @@ class ProjectsNavigationController(BaseController):
     def fetch_projects(self) -> None:
         """
         Fetch all projects from the server that the user has access to.
+
+        If the projects are already being fetched, they are fetched again once
+        that has finished instead, so that several changes in a row (e.g.
+        deleting a few projects) only cause up to two fetches.
         """
+        if self._fetching_projects:
+            self._refetch_projects = True
+            return
+        self._fetching_projects = True
+
         reply: QNetworkReply = self._network_manager.post(
             self._fetch_projects_endpoint,
             to_json_data(
@@ -260,7 +395,111 @@ class ProjectsNavigationController(BaseController):
                 }
             )
         )
-        reply.finished.connect(lambda: self._on_fetch_completion(reply))
+        self._bind_reply(reply, self._on_fetch_completion)
+
+    def fetch_tasks(self, uuid: str, completion_callback: Callable[[dict], None]) -> None:
+        """
+        Fetch all tasks of a project, used for rendering the project's preview.
+
+        This is requested from here rather than the project view controller, so
+        that the project view page is not constructed until a project is opened.
+
+        The tasks of every project requested in the same event loop iteration
+        (e.g. while the project tiles are being created) are fetched together,
+        in one request.
+
+        Args:
+            uuid (str): The uuid of the project.
+            completion_callback (Callable[[dict | None], None]): The callback
+                function for when the tasks have been fetched, given the
+                project's tasks, or None if they could not be fetched.
+        """
+        if not self._pending_task_fetches:
+            QTimer.singleShot(0, self._fetch_task_batch)
+        self._pending_task_fetches.setdefault(uuid, []).append(completion_callback)
+
+    def _fetch_task_batch(self) -> None:
+        """
+        Fetch the tasks of all the projects requested through .fetch_tasks()
+        since the last batch.
+        """
+        pending, self._pending_task_fetches = self._pending_task_fetches, {}
+        if not pending:
+            return
+
+        reply: QNetworkReply = self._network_manager.post(
+            self._fetch_previews_endpoint,
+            to_json_data(
+                {
+                    "project_uuids": list(pending),
+                    "access_token": self._client.cache["access_token"]
+                }
+            )
+        )
+        self._bind_reply(reply, partial(self._on_task_batch_fetched, pending))
+
+    def _on_task_batch_fetched(self, pending: dict[str, list[Callable[[dict], None]]], reply: QNetworkReply) -> None:
+        """
+        A callback function for when a batch of projects' tasks have been
+        fetched.
+
+        Args:
+            pending (dict[str, list[Callable[[dict], None]]]): The callbacks
+                waiting on each project's tasks.
+            reply (QNetworkReply): The reply object from the server.
+        """
+        # Do not proceed if there was an error, other than letting the callbacks
+        # know.
+        if reply.error() != QNetworkReply.NetworkError.NoError:
+            for callbacks in pending.values():
+                for callback in callbacks:
+                    callback(None)
+            return self._handle_error(reply, reply.error())
+
+        payload = get_json_from_reply(reply)
+        handle_new_response_payload(self._client, payload)
+
+        for uuid, callbacks in pending.items():
+            # Projects the user no longer has access to are left out, and given
+            # None.
+            tasks = payload["tasks"].get(uuid)
+            for callback in callbacks:
+                callback(tasks)
+
+    def _on_preview_rendered(self, uuid: str, updated_at: float, q_image: QImage) -> None:
+        """
+        A callback function for when a project's preview has been rendered.
+
+        Args:
+            uuid (str): The uuid of the project.
+            updated_at (float): The updated_at of the project the preview was
+                rendered from.
+            q_image (QImage): The preview image.
+        """
+        q_pixmap = QPixmap.fromImage(q_image)
+
+        _PREVIEW_CACHE[(uuid, updated_at)] = q_pixmap
+        if len(_PREVIEW_CACHE) > PREVIEW_CACHE_SIZE:
+            _PREVIEW_CACHE.popitem(last=False)
+
+        # The project's tile may have been deleted since.
+        item = self._item_by_uuid.get(uuid)
+        if item is not None:
+            item.show_preview(updated_at, q_pixmap)
+
+    def _on_preview_failed(self, uuid: str, updated_at: float) -> None:
+        """
+        A callback function for when a project's preview could not be
+        rendered.
+
+        Args:
+            uuid (str): The uuid of the project.
+            updated_at (float): The updated_at of the project the preview was
+                to be rendered from.
+        """
+        item = self._item_by_uuid.get(uuid)
+        if item is not None:
+            item.preview_failed(updated_at)
 
     def _handle_error(self, reply: QNetworkReply, error: QNetworkReply.NetworkError) -> None:
         """
@@ -296,8 +535,6 @@ class ProjectsNavigationController(BaseController):
         if reply.error() != QNetworkReply.NetworkError.NoError:
             return self._handle_error(reply, reply.error())
         
-        reply.deleteLater()
-
         payload = get_json_from_reply(reply)
         handle_new_response_payload(self._client, payload)
         self.fetch_projects()
@@ -312,7 +549,7 @@ class ProjectsNavigationController(BaseController):
                 }
             )
         )
-        reply.finished.connect(lambda: self._on_new_project_response(reply))
+        self._bind_reply(reply, self._on_new_project_response)
 
     def _on_create_project(self) -> None:
         """
@@ -333,13 +570,16 @@ class ProjectsNavigationController(BaseController):
         """
         self.projects = {}
         self.query = ''
+        self._render_timer.stop()
+        self._render_matches = []
+        self._render_index = 0
 
+        # Detach the tiles rather than deleting them, so that they are reused
+        # by .render_projects() once the projects have been fetched again.
         layout: QGridLayout = self._view.scroll_body.layout()
-        for i in range(layout.count()):
-            item = layout.itemAt(i)
-            if item:
-                widget = item.widget()
-                widget.deleteLater()
+        for item in self._item_by_uuid.values():
+            layout.removeWidget(item)
+            item.hide()
 
     def show(self) -> None:
         """
@@ -359,17 +599,54 @@ class ProjectsNavigationController(BaseController):
         # Bind new project button.
         self._view.new_project_button.clicked.connect(self._on_create_project)
 
-        # Bind search field updated.
-        self._view.search_field.textChanged.connect(self._on_search_query)
+        # Bind search field updated, only filtering the projects once the user
+        # has stopped typing.
+        self._search_timer = QTimer(self._view)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_INTERVAL)
+        self._search_timer.timeout.connect(self._on_search_query)
+        self._view.search_field.textChanged.connect(self._search_timer.start)
+
+        # Render the remaining project tiles, see .render_projects().
+        self._render_timer = QTimer(self._view)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(0)
+        self._render_timer.timeout.connect(self._render_project_batch)
+
+        # Bind preview rendered, which is queued onto the GUI thread.
+        self._preview_signals = PreviewSignals(self._view)
+        self._preview_signals.preview_rendered.connect(self._on_preview_rendered)
+        self._preview_signals.preview_failed.connect(self._on_preview_failed)
 
 class ProjectViewItem(QWidget):
-    ui_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui\\project_view_item.ui")
+    ui_path = str(_UI_DIR / "project_view_item.ui")
 
     def __init__(self, controller: ProjectsNavigationController, name: str, uuid: str) -> None:
         self._controller = controller
+        # The updated_at of the project the preview shown was rendered from.
+        self._updated_at = None
+        # The updated_at of the project the preview being rendered is from, if
+        # any, so the same preview is not rendered twice at once.
+        self._rendering_updated_at = None
         super().__init__(controller._view)
         self._load_ui(name, uuid)
 
+    def update_from(self, project_data: dict) -> None:
+        """
+        Update this item in place to match the project's latest data, rather
+        than creating a new item.
+
+        The preview is only rendered again if the project has changed.
+
+        Args:
+            project_data (dict): The project's data.
+        """
+        if not self.item_name.hasFocus():
+            self.item_name.setText(project_data["name"])
+
+        if project_data["updated_at"] not in (self._updated_at, self._rendering_updated_at):
+            self._load_preview()
+
     def open(self) -> None:
         """
         Open this project
@@ -405,7 +682,7 @@ class ProjectViewItem(QWidget):
         Returns:
             QWidget: The widget object created.
         """
-        widget = uic.load_ui.loadUi(self.ui_path, self)
+        widget = load_ui(self.ui_path, self)
         widget.setObjectName(uuid)
         widget.item_name.setText(name)
 
@@ -419,25 +696,102 @@ class ProjectViewItem(QWidget):
         widget.item_name.returnPressed.connect(self.rename)
         widget.item_name.focusOutEvent = lambda event: self.rename()
 
-        # Set preview image.
-        def on_tasks_fetched(reply: QNetworkReply) -> None:
-            # Do not proceed if there was an error.
-            if reply.error() != QNetworkReply.NetworkError.NoError:
-                return self._controller._handle_error(reply, reply.error())
-            
-            reply.deleteLater()
+        self._load_preview()
+
+        return widget
 
-            payload = get_json_from_reply(reply)
-            handle_new_response_payload(self._controller._client, payload)
+    def _load_preview(self) -> None:
+        """
+        Set the preview image of the project, from the cache if this version of
+        the project has already been rendered.
+        """
+        uuid = self.objectName()
+        updated_at = self._controller.projects[uuid]["updated_at"]
+        preview_key = (uuid, updated_at)
 
-            image = export_project(self._controller.projects[uuid], payload["tasks"])
+        q_pixmap = _PREVIEW_CACHE.get(preview_key)
+        if q_pixmap is not None:
+            _PREVIEW_CACHE.move_to_end(preview_key)
+            self._updated_at = updated_at
+            self._rendering_updated_at = None
+            self.image_preview.setPixmap(q_pixmap)
+            return
 
-            data = image.tobytes("raw", "RGB") 
-            q_image = QImage(data, image.size[0], image.size[1], image.size[0]*3, QImage.Format.Format_RGB888)
-            q_pixmap = QPixmap.fromImage(q_image)
-            widget.image_preview.setPixmap(q_pixmap)
-            widget.image_preview.setScaledContents(True)
+        # Only marked as shown once it has been rendered, so that it is tried
+        # again by .update_from() if it fails.
+        self._rendering_updated_at = updated_at
+        # The preview is rendered without referring to this tile, as it may be
+        # deleted in the meantime. The result goes through the controller.
+        controller = self._controller
+        size = self.image_preview.maximumSize()
+
+        def on_tasks_fetched(tasks: dict | None) -> None:
+            if tasks is None:
+                controller._on_preview_failed(uuid, updated_at)
+                return
+
+            # The project may have been deleted while its tasks were fetched.
+            if uuid not in controller.projects:
+                return
+
+            # Imported here as importing the project view package is expensive,
+            # and is otherwise only needed once a project is opened.
+            from projects.view.export import export_project
+            project_data = controller.projects[uuid]
+
+            def render() -> None:
+                # Runs on the render thread, so only the QImage is created here.
+                # The QPixmap is created on the GUI thread.
+                try:
+                    image = export_project(project_data, tasks)
+                    width, height = image.size
 
-        self._controller._client.main_window.project_view_controller.fetch_tasks(uuid, on_tasks_fetched)
+                    # Pack the pixels as Qt's native 32-bit format, so creating
+                    # the QPixmap from it does not need to convert any pixels.
+                    data = image.tobytes("raw", "BGRX")
+                    q_image = QImage(data, width, height, width*4, QImage.Format.Format_RGB32)
 
-        return widget
+                    # Scale the preview down to the size it is shown at here,
+                    # once, rather than the label scaling it on every paint.
+                    # Copied so the QImage owns its pixels, rather than pointing
+                    # into data.
+                    q_image = q_image.scaled(size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation).copy()
+
+                    controller._preview_signals.preview_rendered.emit(uuid, updated_at, q_image)
+                except Exception as e:
+                    print(f"Failed to render the preview of {uuid}: {e}")
+                    controller._preview_signals.preview_failed.emit(uuid, updated_at)
+
+            controller._render_pool.start(render)
+
+        controller.fetch_tasks(uuid, on_tasks_fetched)
+
+    def show_preview(self, updated_at: float, q_pixmap: QPixmap) -> None:
+        """
+        Show a rendered preview of the project, see
+        ProjectsNavigationController._on_preview_rendered().
+
+        Args:
+            updated_at (float): The updated_at of the project the preview was
+                rendered from.
+            q_pixmap (QPixmap): The preview.
+        """
+        # Do not show the preview if the project has changed since.
+        if updated_at != self._rendering_updated_at:
+            return
+
+        self._updated_at = updated_at
+        self._rendering_updated_at = None
+        self.image_preview.setPixmap(q_pixmap)
+
+    def preview_failed(self, updated_at: float) -> None:
+        """
+        Allow the preview to be rendered again after it failed, see
+        ProjectsNavigationController._on_preview_failed().
+
+        Args:
+            updated_at (float): The updated_at of the project the preview was
+                to be rendered from.
+        """
+        if updated_at == self._rendering_updated_at:
+            self._rendering_updated_at = None
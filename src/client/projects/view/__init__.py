@@ -5,65 +5,168 @@ Projects navigation module.
 Created 12/06/2024
 """
 
-import os
+from pathlib import Path
 from datetime import datetime, timedelta, timezone
-from copy import deepcopy
+from functools import lru_cache, partial
+from collections import deque
+import orjson
 
-from PyQt6 import uic
-from PyQt6.QtNetwork import QNetworkRequest, QNetworkReply, QNetworkReply
-from PyQt6.QtCore import QUrl
+from PyQt6.QtCore import QSize, QTimer
+from PyQt6.QtNetwork import QNetworkReply
 from PyQt6.QtGui import (
     QAction,
     QMouseEvent,
-    QFont,
     QKeySequence
 )
-from PyQt6.QtWidgets import QWidget, QMenuBar, QLabel, QFrame, QFileDialog
+from PyQt6.QtWidgets import QWidget, QMenuBar, QLabel, QFrame, QFileDialog, QGridLayout
 
 from utils.window.page_base import BasePage
+from utils.window.ui_loader import load_ui
 from utils.window.controller_base import BaseController
-from utils.server_response import get_json_from_reply, to_json_data, handle_new_response_payload
+from utils.server_response import get_json_from_reply, to_json_data, handle_new_response_payload, create_endpoint
 from utils.dialog import create_message_dialog
 
 from .config import (
     CELL_HEIGHT,
     CELL_WIDTH,
     EVEN_COLUMN_COLOUR,
-    ODD_COLUMN_COLOUR,
+    HISTORY_LENGTH,
     TEMPLATE_ROWS
 )
 from .task_edit import TaskEditWindow, TaskEditController
-from .timeline import TimelineGridWidget, set_timeline_objects
+from .timeline import TimelineGridWidget, TimelineBackground, TimelineDates, set_timeline_objects
 from .task_items import TimelineTaskItem, TimelineMilestoneItem
-from .inheritence_arrows import Arrow
+from .inheritence_arrows import Arrow, ArrowCanvas
 from .export import export_project
-set_timeline_objects(TimelineTaskItem, TimelineMilestoneItem)
+from .history import HistoryRing
+
+# Whether the timeline module has been given the task item classes, see
+# _setup_timeline_objects().
+_timeline_objects_set = False
+
+def _setup_timeline_objects() -> None:
+    """
+    Give the timeline module the task item classes it checks dragged items
+    against. This is done once, when the first project view page is created,
+    rather than when this module is imported.
+    """
+    global _timeline_objects_set
+    if _timeline_objects_set:
+        return
+    set_timeline_objects(TimelineTaskItem, TimelineMilestoneItem)
+    _timeline_objects_set = True
+
+_UI_DIR = Path(__file__).resolve().parent / "ui"
+
+# The number of seconds in a day, and half a day, for converting dates to
+# timeline columns. See ProjectViewController._get_column().
+_SECONDS_PER_DAY = 24 * 60 * 60
+_HALF_DAY = _SECONDS_PER_DAY / 2
+
+# The fixed sizes of the placeholder rows in the task list and the timeline.
+_TASK_ROW_SIZE = QSize(400, CELL_HEIGHT)
+_TIMELINE_ROW_SIZE = QSize(CELL_WIDTH, CELL_HEIGHT)
+
+# The endpoint is constant for the whole process, so build it once.
+_FETCH_ALL_TASKS_ENDPOINT = create_endpoint("/project/task/fetch-all")
+
+@lru_cache(maxsize=4096)
+def _date_from_timestamp(timestamp: float) -> datetime:
+    """
+    Get the local date and time of a timestamp. Task dates are converted on
+    every render, so the conversions are cached.
+
+    Args:
+        timestamp (float): The timestamp, in seconds.
+
+    Returns:
+        datetime: The local date and time.
+    """
+    return datetime.fromtimestamp(timestamp)
+
+# The styles of the widgets created for the timeline and the task list, set once
+# on their containers and matched by object name, rather than parsing a style
+# sheet for every widget. They are set on the closest container, as a closer
+# ancestor's style sheet takes precedence over these.
+_TIMELINE_STYLE_SHEET = f"""
+QLabel#row_placeholder {{
+    background: {EVEN_COLUMN_COLOUR};
+}}
+"""
+_TASK_LIST_STYLE_SHEET = """
+QFrame#row_placeholder {
+    background: #1e2749;
+}
+"""
 
 
 class ProjectViewPage(BasePage):
-    ui_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui\\project_view_page.ui")
+    ui_path = str(_UI_DIR / "project_view_page.ui")
 
     def __init__(self) -> None:
         """Class initialisation."""
+        _setup_timeline_objects()
         super().__init__()
 
         self._setup_drag_area()
 
+        self.tasks_frame.setStyleSheet(_TASK_LIST_STYLE_SHEET)
+
     def assign_controller(self, controller: BaseController) -> None:
         super().assign_controller(controller)
 
-        self.drag_area.grid_updated.connect(self._controller.grid_updated)
-        self.drag_area.dependency_updated.connect(self._controller.dependency_updated)
-        self.drag_area.hide_arrows.connect(self._controller.hide_arrows)
-        self.drag_area.show_arrows.connect(self._controller.show_arrows)
+        self._connect_drag_area()
 
     def _setup_drag_area(self) -> None:
         """Setup the drag area for the timeline."""
         self.drag_area = TimelineGridWidget(self.timeline_scroll_area)
-        self._test_arrow = Arrow(self.drag_area)
-        self._test_arrow.set_source_destination(0, 0, 1, 1)
+        self.drag_area.setStyleSheet(_TIMELINE_STYLE_SHEET)
         self.timeline_scroll_area.layout().addWidget(self.drag_area, 0, 0)
 
+        # The dependency arrows are all painted on one canvas, covering the
+        # whole drag area.
+        self.arrow_canvas = ArrowCanvas(self.drag_area)
+        self.drag_area.layout().addWidget(self.arrow_canvas, 0, 0, -1, -1)
+
+    def _connect_drag_area(self) -> None:
+        """Connect the drag area's signals to the controller."""
+        self.drag_area.grid_updated.connect(self._controller.grid_updated)
+        self.drag_area.dependency_updated.connect(self._controller.dependency_updated)
+        self.drag_area.hide_arrows.connect(self._controller.hide_arrows)
+        self.drag_area.show_arrows.connect(self._controller.show_arrows)
+
+    def reset_drag_area(self) -> None:
+        """
+        Replace the drag area with a new, empty one. This removes everything
+        set up in the timeline for the previous project, such as its background
+        and dates, so that they are not set up again on top of it.
+        """
+        self.timeline_scroll_area.layout().removeWidget(self.drag_area)
+        self.drag_area.deleteLater()
+
+        self._setup_drag_area()
+        self._connect_drag_area()
+
+    def suspend_updates(self) -> None:
+        """
+        Hold off repainting the page and laying out the timeline and task list
+        while many widgets are added, moved or removed. Must be followed by
+        .resume_updates().
+        """
+        self.setUpdatesEnabled(False)
+        self.drag_area.layout().setEnabled(False)
+        self.tasks_frame.layout().setEnabled(False)
+
+    def resume_updates(self) -> None:
+        """
+        Lay out the timeline and task list, and repaint the page, once, after
+        .suspend_updates().
+        """
+        for layout in (self.drag_area.layout(), self.tasks_frame.layout()):
+            layout.setEnabled(True)
+            layout.activate()
+        self.setUpdatesEnabled(True)
+
     def setup_task_rows(self) -> None:
         """
         Create rows of placeholder frames to set a fixed height for each row in
@@ -73,15 +176,10 @@ class ProjectViewPage(BasePage):
             row_label = QFrame(self)
             
             # Set a rigid size
-            row_label.setMaximumSize(400, 35)
-            row_label.setMinimumSize(400, 35)
-
-            # Blend with the background
-            row_label.setStyleSheet(
-                """
-                background: #1e2749;
-                """
-            )
+            row_label.setFixedSize(_TASK_ROW_SIZE)
+
+            # Blend with the background, see _TASK_LIST_STYLE_SHEET.
+            row_label.setObjectName("row_placeholder")
 
             self.tasks_frame.layout().addWidget(row_label, i+1, 0)
 
@@ -93,29 +191,23 @@ class ProjectViewPage(BasePage):
         # the timeline can be extended.
         total_columns = (end_date - start_date).days + 1
 
-        # Set a sont for the date labels.
-        font = QFont()
-        font.setBold(True)
-        font.setFamily("Segoe Ui")
-        font.setPixelSize(14)
-
+        # The dates are painted by a single widget spanning every column.
+        # Each date is formatted as "%d %b", with the (locale's) month names
+        # only formatted once rather than for every day.
+        months = [datetime(2000, month, 1).strftime("%b") for month in range(1, 13)]
+        dates = []
+        one_day = timedelta(days=1)
+        date = start_date
+        for _ in range(total_columns):
+            dates.append(f"{date.day:02d} {months[date.month - 1]}")
+            date += one_day
+        layout: QGridLayout = self.drag_area.layout()
+        layout.addWidget(TimelineDates(dates, self), 0, 0, 1, total_columns)
+
+        # Fix the width of each column, as there is no longer a label in each
+        # column to do so.
         for day in range(total_columns):
-            day_label = QLabel(self)
-            day_label.setText((start_date + timedelta(days=day)).strftime("%d %b"))
-            day_label.setStyleSheet(
-                f"""
-                border: 2px solid #979ea8;
-                background: {EVEN_COLUMN_COLOUR};
-                color: #ffffff;
-                qproperty-alignment: AlignCenter;
-                """
-            )
-            day_label.setFont(font)
-            day_label.setMaximumSize(CELL_WIDTH, CELL_HEIGHT)
-            day_label.setMinimumSize(CELL_WIDTH, CELL_HEIGHT)
-
-            # Top row, in their respective column.
-            self.drag_area.layout().addWidget(day_label, 0, day)
+            layout.setColumnMinimumWidth(day, CELL_WIDTH)
 
     def setup_timeline(self, start_date: datetime, end_date: datetime) -> None:
         """
@@ -129,31 +221,23 @@ class ProjectViewPage(BasePage):
         # Same number of columns as .setup_timeline_dates()
         total_columns = (end_date - start_date).days + 1
 
-        # Alternating shade of the background colour for the timeline columns.
-        for i in range(total_columns):
-            column_frame = QFrame(self)
-            if i % 2 == 0:
-                # Even column
-                column_frame.setStyleSheet(f"background: {EVEN_COLUMN_COLOUR};")
-            else:
-                # Odd column
-                column_frame.setStyleSheet(f"background: {ODD_COLUMN_COLOUR};")
-
-            self.drag_area.layout().addWidget(column_frame, 1, i, 100, 1)
+        # Alternating shade of the background colour for the timeline columns,
+        # painted by a single widget spanning every column.
+        background = TimelineBackground(total_columns, self)
+        self.drag_area.layout().addWidget(background, 1, 0, 100, total_columns)
+        # Keep the background below everything else in the timeline, such as
+        # the dependency arrows.
+        background.lower()
 
         # Create rows of placeholder frames to set a fixed height for each row in
         # the project timeline.
         for i in range(TEMPLATE_ROWS):
             row_label = QLabel(self)
-            row_label.setStyleSheet(
-                f"""
-                background: {EVEN_COLUMN_COLOUR};
-                """
-            )
+            # Styled by _TIMELINE_STYLE_SHEET.
+            row_label.setObjectName("row_placeholder")
 
             # Set a rigid size.
-            row_label.setMaximumSize(80, 35)
-            row_label.setMinimumSize(80, 35)
+            row_label.setFixedSize(_TIMELINE_ROW_SIZE)
 
             self.drag_area.layout().addWidget(row_label, i, 0)
         
@@ -218,14 +302,25 @@ class ProjectViewController(BaseController):
 
         self._task_items = {}
         self._row_items = {}
+        # Row items no longer in use, kept to be reused rather than created
+        # again, see ._release_row_item().
+        self._row_item_pool = []
         self._arrow_items = {}
+        # What each task was last rendered with, see ._render_task().
+        self._rendered_tasks = {}
+        # The task in each row, see ._index_rows().
+        self._row_tasks = None
+        self._history = HistoryRing(HISTORY_LENGTH)
+        self.start_date = None
+        # The tasks changed or deleted that have not been sent to the server
+        # yet, see .schedule_render().
+        self._unsaved_tasks = set()
+        self._deleted_tasks = set()
 
         self.reset()
 
     def _setup_endpoints(self) -> None:
-        self._fetch_all_tasks = QNetworkRequest()
-        self._fetch_all_tasks.setUrl(QUrl(f"{os.getenv('SERVER_ADDRESS')}/project/task/fetch-all"))
-        self._fetch_all_tasks.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
+        self._fetch_all_tasks = _FETCH_ALL_TASKS_ENDPOINT
     
     def _handle_error(self, reply: QNetworkReply, error: QNetworkReply.NetworkError) -> None:
         """
@@ -263,8 +358,6 @@ class ProjectViewController(BaseController):
         if reply.error() != QNetworkReply.NetworkError.NoError:
             return self._handle_error(reply, reply.error())
         
-        reply.deleteLater()
-
         payload = get_json_from_reply(reply)
         handle_new_response_payload(self._client, payload)
         self._tasks = payload["tasks"]
@@ -286,18 +379,27 @@ class ProjectViewController(BaseController):
                 # If there are tasks, then set the start date to the earliest
                 # start date of the tasks and the end date to the latest end date
                 # of the tasks or minimim_latest, whichever is later.
-                self.start_date = datetime.fromtimestamp(min([task["start_date"] for task in self._tasks.values()]))
-                self.end_date = datetime.fromtimestamp(max([max(minimim_latest.timestamp(), task["end_date"]) for task in self._tasks.values()]))
+                tasks = self._tasks.values()
+                self.start_date = datetime.fromtimestamp(min(task["start_date"] for task in tasks))
+                self.end_date = datetime.fromtimestamp(max(minimim_latest.timestamp(), max(task["end_date"] for task in tasks)))
+
+            # The start date as a timestamp, which task dates are compared
+            # against to get their columns.
+            self._start_timestamp = self.start_date.timestamp()
 
             # Essential setup for the user-interface of the timeline.
             # Only called once for the first time the project is loaded, as the
             # start_date and end_date are set after the first time, and the
             # if statement above will not be executed again unless the project
             # is closed and re-opened.
-            self._view.setup_task_rows()
-            self._view.setup_timeline(self.start_date, self.end_date)
-            self._view.drag_area.setup_drag_indicator()
-            self._view.setup_timeline_dates(self.start_date, self.end_date)
+            self._view.suspend_updates()
+            try:
+                self._view.setup_task_rows()
+                self._view.setup_timeline(self.start_date, self.end_date)
+                self._view.drag_area.setup_drag_indicator()
+                self._view.setup_timeline_dates(self.start_date, self.end_date)
+            finally:
+                self._view.resume_updates()
 
         # Render the tasks on the timeline, whether it be on the first time, or
         # updating the tasks.
@@ -323,7 +425,7 @@ class ProjectViewController(BaseController):
                 }
             )
         )
-        reply.finished.connect(lambda: completion_callback(reply) if not completion_callback is None else self._on_fetch_completion(reply))
+        self._bind_reply(reply, self._on_fetch_completion if completion_callback is None else completion_callback)
 
     def _create_task_object(self, task_type: str) -> None:
         """
@@ -356,179 +458,141 @@ class ProjectViewController(BaseController):
         """
         Reset the data held in this controller, as well as the user-interface.
         """
+        # Send any changes that are still waiting for the next render.
+        self._render_timer.stop()
+        self._save_changes()
+
         # Clear data
         self._project_data = None
         self._tasks = {}
-        self._history = []
+        self._history.clear()
         self._history_index = 0
+        # The project data and tasks at the current checkpoint, serialised. See
+        # .set_history_checkpoint().
+        self._history_project = None
+        self._history_tasks = {}
+
+        # The timeline has been set up if there is a start date, see
+        # ._on_fetch_completion().
+        timeline_setup = self.start_date is not None
         
         self.start_date = None
         self.end_date = None
+        self._start_timestamp = None
 
         # Clear task UI items in the timeline.
         for item in self._task_items.values():
             self._view.drag_area.grid_layout.removeWidget(item)
             item.deleteLater()
         self._task_items = {}
+        self._rendered_tasks = {}
+        self._row_tasks = None
 
         # Clear task UI items in the task list (on the left).
         for item in self._row_items.values():
-            self._view.tasks_frame.layout().removeWidget(item)
-            item.deleteLater()
+            self._release_row_item(item)
         self._row_items = {}
         
-        # Clear the timeline UI object.
-        item = self._view.drag_area.findChild(TimelineGridWidget)
-        if item:
-            self._view.timeline_scroll_area.removeWidget(item)
-            item.deleteLater()
-        
         # Clear the dependency arrow objects
         for arrow in self._arrow_items.values():
-            arrow._scene.clear()
-            self._view.drag_area.layout().removeWidget(arrow._view)
-            arrow._view.deleteLater()
+            arrow.remove()
         self._arrow_items = {}
 
-    def _get_item_double_click_callback(self, task_data: dict) -> None:
+        # Clear the timeline UI object, by replacing the drag area it was set
+        # up in.
+        if timeline_setup:
+            self._view.reset_drag_area()
+
+    def _on_item_double_click(self, task_uuid: str, mouse_event: QMouseEvent) -> None:
         """
-        Get the callback function for when a task item is double-clicked. This
-        will prompt the task edit window to edit the task.
+        A callback function for when a task item is double-clicked. This will
+        prompt the task edit window to edit the task.
+
+        The task data is looked up when the item is double-clicked, so that the
+        latest data is edited even if the tasks have been replaced since the
+        item was created e.g. by undoing.
 
         Args:
-            task_data (dict): The task data as a dictionary object to edit.
+            task_uuid (str): The UUID of the task that was double-clicked.
+            mouse_event (QMouseEvent): The mouse event.
         """
+        task_data = self._tasks.get(task_uuid)
+        if task_data is None:
+            return
 
-        def callback(mouse_event: QMouseEvent) -> None:
-            # Clear all previous data from the task edit controller, if any.
-            # Also set the task data to the task data passed in.
-            # Then show the task edit window.
-            self.task_edit_controller.reset(task_data["task_type"], task_data)
-            self.task_edit_window.show()
-        
-        return callback
+        # Clear all previous data from the task edit controller, if any.
+        # Also set the task data to the task data passed in.
+        # Then show the task edit window.
+        self.task_edit_controller.reset(task_data["task_type"], task_data)
+        self.task_edit_window.show()
 
     def render(self) -> None:
         """
         Render the project view with the tasks and milestones as user interface
         items.
 
-        Creates, updates, or removes task items and row items as necessary.
+        Creates, updates, or removes task items and row items as necessary. The
+        page is only laid out and repainted once, after every item is in place.
         """
-        # Iterate every task in the project.
-        for task_uuid, source_task in self._tasks.items():
-            for dependency in source_task["dependencies"]:
-                destination_task = self._tasks[dependency]
-
-                source_start_column = (datetime.fromtimestamp(source_task["start_date"]) - self.start_date).days
-                source_end_column = (datetime.fromtimestamp(source_task["end_date"]) - self.start_date).days
-
-                destination_start_column = (datetime.fromtimestamp(destination_task["start_date"]) - self.start_date).days
-                destination_end_column = (datetime.fromtimestamp(destination_task["end_date"]) - self.start_date).days
-
-                arrow = self._arrow_items.get(f"{task_uuid}:{dependency}")
-                if arrow is None:
-                    arrow = Arrow(self._view.drag_area)
-                    self._arrow_items[f"{task_uuid}:{dependency}"] = arrow
-                
-                arrow.set_source_destination(source_task["row"]+1, source_end_column-1, destination_task["row"]+1, destination_start_column)
-        
-        dependency_keys = [f"{task_uuid}:{dependency}" for task_uuid in self._tasks for dependency in self._tasks[task_uuid]["dependencies"]]
-        for key in list(self._arrow_items.keys()):
-            if key not in dependency_keys:
-                arrow = self._arrow_items[key]
-                arrow._scene.clear()
-                arrow._view.hide()
-                self._view.drag_area.layout().removeWidget(arrow._view)
-                arrow._view.deleteLater()
-                self._arrow_items.pop(key)
+        self._view.suspend_updates()
+        try:
+            self._render_items()
+        finally:
+            self._view.resume_updates()
 
-        # Iterate every task in the project.
-        for task_uuid, task in self._tasks.items():
-            # Calculate the start and end column of the task for the timeline
-            # grid.
-            start_column = (datetime.fromtimestamp(task["start_date"]) - self.start_date).days
-            end_column = (datetime.fromtimestamp(task["end_date"]) - self.start_date).days
-
-            # If the task is outside the timeline to the left beyond the start
-            # date column, then load the project again but this time with a new
-            # earlier start date. See the .fetch_tasks() function for more
-            # information.
-            if start_column < 0:
-                project_data = self._project_data
-                self.reset()
-                return self.load(project_data)
-
-            # This is the number of days the task spans across i.e. length of
-            # task.
-            days = end_column - start_column
-
-            if not task_uuid in self._task_items.keys():
-                # If the task item does not exist, then create it.
-                # Create the task/milestone object.
-                class_type = TimelineMilestoneItem if task["task_type"] == "milestone" else TimelineTaskItem
-                self._task_items[task_uuid] = class_type(task_uuid, task["name"], task["colour"], parent=self._view.drag_area)
-
-                # Add this task item to the timeline grid layout.
-                self._view.drag_area.add_item(self._task_items[task_uuid], task["row"]+1, start_column, 1, days)
-                self._task_items[task_uuid].show()
-
-                # Set the task item's double-click event to prompt the task edit
-                # window to edit the task.
-                self._task_items[task_uuid].mouseDoubleClickEvent = self._get_item_double_click_callback(task)
-            else:
-                # If the task item exists, then update it.
-                # Update the task item's position and size in the timeline grid.
-                self._view.drag_area.grid_layout.addWidget(self._task_items[task_uuid], task["row"]+1, start_column, 1, days)
-
-                # Update the task item's name and colour.
-                self._task_items[task_uuid].set_name(task["name"])
-                self._task_items[task_uuid].set_colour(task["colour"])
+    def _get_column(self, timestamp: float) -> int:
+        """
+        Get the column of the timeline grid for a date.
 
-            self._task_items[task_uuid].min_row = 0
-            self._task_items[task_uuid].min_column = 0
-            
-            if not task_uuid in self._row_items.keys():
-                # If the row item (on the left panel) does not exist, then
-                # create it.
-                self._row_items[task_uuid] = RowLabel(parent=self._view.drag_area)
-                self._row_items[task_uuid].show()
-            
-            # Set the row item's task data.
-            # This is applied regardless of whether the row item has been created
-            # just now, or already exists.
-            self._row_items[task_uuid].set_task_data(task["name"], datetime.fromtimestamp(task["start_date"]), datetime.fromtimestamp(task["end_date"]), task["completed"])
-            self._view.tasks_frame.layout().addWidget(self._row_items[task_uuid], task["row"]+1, 0)
+        Args:
+            timestamp (float): The date, as a timestamp.
 
-        def dependency_recursion(task_uuid: int, parent_task: dict = None) -> None:
-            task = self._tasks[task_uuid]
+        Returns:
+            int: The column, counting days from the start of the timeline.
+        """
+        # Task dates are at (local) midnight, so the difference from the start
+        # date is rounded to the nearest whole day, rather than floored. This
+        # keeps dates across a daylight saving change, which are an hour off
+        # from a whole number of days, in the right column.
+        return int((timestamp - self._start_timestamp + _HALF_DAY) // _SECONDS_PER_DAY)
 
-            if not parent_task is None:
-                self._task_items[task_uuid].min_row = parent_task["row"] + 2
-                self._task_items[task_uuid].min_column = (datetime.fromtimestamp(parent_task["end_date"]) - self.start_date).days
+    def _render_items(self) -> None:
+        """
+        Create, update, or remove the task items, row items and dependency
+        arrows. See .render().
+        """
+        # Tasks may have been added or removed since the last render.
+        self._index_rows()
 
+        # Iterate every task in the project, keeping the keys of the arrows
+        # rendered.
+        dependency_keys = set()
+        for task_uuid, task in self._tasks.items():
             for dependency in task["dependencies"]:
-                dependency_recursion(dependency, task)
+                dependency_keys.add(self._render_arrow(task_uuid, dependency))
         
+        # Remove the arrows of dependencies that no longer exist.
+        for key in self._arrow_items.keys() - dependency_keys:
+            self._arrow_items.pop(key).remove()
+
+        # Iterate every task in the project.
         for task_uuid in self._tasks:
-            task = self._tasks[task_uuid]
-            for dependency in task["dependencies"]:
-                dependency_recursion(dependency, task)
-
-        # Iterate every task item in the timeline to check if any tasks have
-        # been removed from the project.
-        for task_uuid, item in list(self._task_items.items()):
-            item.raise_()
-            if not task_uuid in self._tasks.keys():
-                # Delete the task item.
-                self._view.drag_area.grid_layout.removeWidget(item)
-                self._task_items.pop(task_uuid)
-                item.deleteLater()
-
-                # Delete the row item.
-                row_item = self._row_items[task_uuid]
-                self._row_items.pop(task_uuid)
-                row_item.deleteLater()
+            if self._render_task(task_uuid):
+                return
+
+        self._update_dependency_bounds()
+
+        # Remove the items of any tasks that have been removed from the
+        # project.
+        for task_uuid in self._task_items.keys() - self._tasks.keys():
+            # Delete the task item.
+            item = self._task_items.pop(task_uuid)
+            self._view.drag_area.grid_layout.removeWidget(item)
+            item.deleteLater()
+            self._rendered_tasks.pop(task_uuid, None)
+
+            # Put the row item aside to be reused.
+            self._release_row_item(self._row_items.pop(task_uuid))
 
         # Update the maximum number of rows in the drag area.
         # This is for the drag indicator to know how many rows there are in the
@@ -541,19 +605,200 @@ class ProjectViewController(BaseController):
 
         self._view.drag_area.tasks_updated.emit([self._tasks])
 
+    def render_tasks(self, task_uuids: set[str]) -> None:
+        """
+        Render only some tasks again after they have been moved, along with the
+        dependency arrows to and from them, rather than every task like
+        .render().
+
+        The tasks must already have been rendered, and no tasks or dependencies
+        added or removed since.
+
+        Args:
+            task_uuids (set[str]): The UUIDs of the tasks that have been moved.
+        """
+        self._view.suspend_updates()
+        try:
+            for task_uuid, task in self._tasks.items():
+                for dependency in task["dependencies"]:
+                    if task_uuid in task_uuids or dependency in task_uuids:
+                        self._render_arrow(task_uuid, dependency)
+
+            for task_uuid in task_uuids:
+                # The task item may have been moved by dragging it, so place it
+                # again even if the task itself has not changed.
+                self._rendered_tasks.pop(task_uuid, None)
+                if self._render_task(task_uuid):
+                    return
+
+            self._update_dependency_bounds()
+
+            self._view.drag_area.tasks_updated.emit([self._tasks])
+        finally:
+            self._view.resume_updates()
+
+    def _render_arrow(self, task_uuid: str, dependency: str) -> str:
+        """
+        Create or update the arrow from a task to a task that depends on it.
+
+        Args:
+            task_uuid (str): The UUID of the task.
+            dependency (str): The UUID of the task that depends on it.
+
+        Returns:
+            str: The key of the arrow in ._arrow_items.
+        """
+        source_task = self._tasks[task_uuid]
+        destination_task = self._tasks[dependency]
+
+        source_end_column = self._get_column(source_task["end_date"])
+        destination_start_column = self._get_column(destination_task["start_date"])
+
+        key = f"{task_uuid}:{dependency}"
+        arrow = self._arrow_items.get(key)
+        if arrow is None:
+            arrow = Arrow(self._view.arrow_canvas)
+            self._arrow_items[key] = arrow
+        
+        arrow.set_source_destination(source_task["row"]+1, source_end_column-1, destination_task["row"]+1, destination_start_column)
+        return key
+
+    def _render_task(self, task_uuid: str) -> bool:
+        """
+        Create or update the task item in the timeline, and its row item in the
+        task list, for a task.
+
+        Args:
+            task_uuid (str): The UUID of the task.
+
+        Returns:
+            bool: Whether the project is being loaded again instead, as the task
+                starts before the timeline does.
+        """
+        task = self._tasks[task_uuid]
+        # Look up the task's fields once, as they are used several times below.
+        start_date = task["start_date"]
+        end_date = task["end_date"]
+        name = task["name"]
+        colour = task["colour"]
+        row = task["row"] + 1
+        drag_area = self._view.drag_area
+
+        # Calculate the start and end column of the task for the timeline
+        # grid.
+        start_column = self._get_column(start_date)
+        end_column = self._get_column(end_date)
+
+        # If the task is outside the timeline to the left beyond the start
+        # date column, then load the project again but this time with a new
+        # earlier start date. See the .fetch_tasks() function for more
+        # information.
+        if start_column < 0:
+            project_data = self._project_data
+            self.reset()
+            self.load(project_data)
+            return True
+
+        # This is the number of days the task spans across i.e. length of
+        # task.
+        days = end_column - start_column
+
+        # Skip the task if nothing shown for it has changed since it was last
+        # rendered.
+        rendered = (row, start_column, days, name, colour, start_date, end_date, task["completed"])
+        if self._rendered_tasks.get(task_uuid) == rendered:
+            return False
+        self._rendered_tasks[task_uuid] = rendered
+
+        item = self._task_items.get(task_uuid)
+        if item is None:
+            # If the task item does not exist, then create it.
+            # Create the task/milestone object.
+            class_type = TimelineMilestoneItem if task["task_type"] == "milestone" else TimelineTaskItem
+            item = class_type(task_uuid, name, colour, parent=drag_area)
+            self._task_items[task_uuid] = item
+
+            # Add this task item to the timeline grid layout.
+            drag_area.add_item(item, row, start_column, 1, days)
+            item.show()
+
+            # Set the task item's double-click event to prompt the task edit
+            # window to edit the task.
+            item.mouseDoubleClickEvent = partial(self._on_item_double_click, task_uuid)
+        else:
+            # If the task item exists, then update it.
+            # Update the task item's position and size in the timeline grid.
+            drag_area.grid_layout.addWidget(item, row, start_column, 1, days)
+
+            # Update the task item's name and colour.
+            item.set_name(name)
+            item.set_colour(colour)
+        
+        row_item = self._row_items.get(task_uuid)
+        if row_item is None:
+            # If the row item (on the left panel) does not exist, then
+            # reuse one put aside or create it.
+            if self._row_item_pool:
+                row_item = self._row_item_pool.pop()
+            else:
+                row_item = RowLabel(parent=drag_area)
+            self._row_items[task_uuid] = row_item
+            row_item.show()
+        
+        # Set the row item's task data.
+        # This is applied regardless of whether the row item has been created
+        # just now, or already exists.
+        row_item.set_task_data(name, _date_from_timestamp(start_date), _date_from_timestamp(end_date), task["completed"])
+        self._view.tasks_frame.layout().addWidget(row_item, row, 0)
+        return False
+
+    def _release_row_item(self, row_item: "RowLabel") -> None:
+        """
+        Remove a row item from the task list, and put it aside to be reused by
+        a later task. Row items are kept as they are slow to create.
+
+        Args:
+            row_item (RowLabel): The row item.
+        """
+        self._view.tasks_frame.layout().removeWidget(row_item)
+        row_item.hide()
+        self._row_item_pool.append(row_item)
+
+    def _update_dependency_bounds(self) -> None:
+        """
+        Update how far up and left each task item can be dragged to.
+
+        A task cannot be moved above the row after, or before the end of, any
+        task it depends on. Each dependency is only looked at once.
+        """
+        task_items = self._task_items
+        for task_uuid in self._tasks:
+            item = task_items[task_uuid]
+            item.min_row = 0
+            item.min_column = 0
+
+        for task in self._tasks.values():
+            dependencies = task["dependencies"]
+            if not dependencies:
+                continue
+            parent_min_row = task["row"] + 2
+            parent_end_column = self._get_column(task["end_date"])
+            for dependency in dependencies:
+                item = task_items[dependency]
+                item.min_row = max(item.min_row, parent_min_row)
+                item.min_column = max(item.min_column, parent_end_column)
+
     def hide_arrows(self, data: list = []) -> None:
         """
         Hide the dependency arrows in the timeline.
         """
-        for arrow in self._arrow_items.values():
-            arrow._view.hide()
+        self._view.arrow_canvas.hide()
 
     def show_arrows(self, data: list = []) -> None:
         """
         Show the dependency arrows in the timeline.
         """
-        for arrow in self._arrow_items.values():
-            arrow._view.show()
+        self._view.arrow_canvas.show()
 
     def load(self, project_data: dict) -> None:
         """
@@ -623,29 +868,88 @@ class ProjectViewController(BaseController):
             task_data["start_date"] = new_start_date
             task_data["end_date"] = new_end_date
 
-            def recursive_shift(task_uuid: int, parent_task: dict = None) -> None:
-                task = self._tasks[task_uuid]
-
-                if not parent_task is None:
+            # Shift the tasks that depend on this task, directly or not, so
+            # that none starts before or sits above a task it depends on. Each
+            # task is only shifted once all the tasks it depends on have been.
+            dependents = self._get_dependents_in_order(task_uuid)
+            for dependent_uuid in dependents:
+                parent_task = self._tasks[dependent_uuid]
+                for dependency in parent_task["dependencies"]:
+                    task = self._tasks[dependency]
                     if task["start_date"] < parent_task["end_date"]:
                         shift = parent_task["end_date"] - task["start_date"]
                         task["start_date"] = task["start_date"] + shift
                         task["end_date"] = task["end_date"] + shift
 
                     if task["row"] <= parent_task["row"]:
-                        self.change_task_row(task_uuid, parent_task["row"])
-
-                self.task_edit_controller.update_task(task)
-                for dependency in task["dependencies"]:
-                    recursive_shift(dependency, task)
-            recursive_shift(task_uuid)
+                        self.change_task_row(dependency, parent_task["row"])
 
-            self.task_edit_controller.update_task(task_data)
+            # Queue this task and the tasks depending on it to be saved, all in
+            # one request, see .schedule_render().
+            self._unsaved_tasks.update(dependents)
+            self.schedule_render()
 
-            self.render()
+            # Only this task and the tasks depending on it can have moved.
+            self.render_tasks(set(dependents))
 
             self.set_history_checkpoint()
 
+    def _get_dependents_in_order(self, task_uuid: str) -> list[str]:
+        """
+        Get a task and every task that depends on it, directly or not, with
+        each task after all of the tasks it depends on.
+
+        Every task is only included once, no matter how many dependencies lead
+        to it. Tasks caught in a cycle of dependencies are left out.
+
+        Args:
+            task_uuid (str): The UUID of the task to start from.
+
+        Returns:
+            list[str]: The UUIDs of the tasks, starting with task_uuid.
+        """
+        # Find every task that depends on the task.
+        dependents = {task_uuid}
+        stack = [task_uuid]
+        while stack:
+            for dependency in self._tasks[stack.pop()]["dependencies"]:
+                if dependency not in dependents:
+                    dependents.add(dependency)
+                    stack.append(dependency)
+
+        # Count how many of those tasks each task depends on. The first task
+        # comes first regardless.
+        remaining = dict.fromkeys(dependents, 0)
+        for uuid in dependents:
+            for dependency in self._tasks[uuid]["dependencies"]:
+                if dependency != task_uuid:
+                    remaining[dependency] += 1
+
+        # Take each task once every task it depends on has been taken.
+        order = []
+        queue = deque([task_uuid])
+        while queue:
+            uuid = queue.popleft()
+            order.append(uuid)
+            for dependency in self._tasks[uuid]["dependencies"]:
+                if dependency == task_uuid:
+                    continue
+                remaining[dependency] -= 1
+                if remaining[dependency] == 0:
+                    queue.append(dependency)
+        return order
+
+    def _index_rows(self) -> dict[int, str]:
+        """
+        Index which task is in each row, so that the tasks in a range of rows
+        can be found without searching every task. See .change_task_row().
+
+        Returns:
+            dict[int, str]: The UUID of the task in each row.
+        """
+        self._row_tasks = {task["row"]: task_uuid for task_uuid, task in self._tasks.items()}
+        return self._row_tasks
+
     def change_task_row(self, task_uuid: int, row: int) -> None:
         """
         Change the row of a task by shifting the rows of other tasks.
@@ -655,31 +959,43 @@ class ProjectViewController(BaseController):
             row (int): The new row to assign to the task.
         """
         task_data = self._tasks[task_uuid]
+        old_row = task_data["row"]
 
-        if task_data["row"] == row:
+        if old_row == row:
             # No changes made, ignore.
             return
 
-        if row > task_data["row"]:
-            # If the new row is greater than the old row, then shift the rows
-            # of the tasks above the old row down by one.
-            for other_task in self._tasks.values():
-                if other_task["row"] > task_data["row"] and other_task["row"] <= row:
-                    other_task["row"] -= 1
-                    self.task_edit_controller.update_task(other_task)
-        else:
-            # If the new row is less than the old row, then shift the rows of
-            # the tasks below the old row up by one.
-            for other_task in self._tasks.values():
-                if other_task["row"] < task_data["row"] and other_task["row"] >= row:
-                    other_task["row"] += 1
-                    self.task_edit_controller.update_task(other_task)
+        row_tasks = self._row_tasks
+        if row_tasks is None or row_tasks.get(old_row) != task_uuid:
+            # The index is out of date, e.g. the task was created since the
+            # last render.
+            row_tasks = self._index_rows()
+
+        # If the new row is greater than the old row, then decrease the rows
+        # of the tasks between the old and new rows by one. Otherwise,
+        # increase them by one. Only the rows in between are looked at.
+        step = 1 if row > old_row else -1
+
+        # The tasks whose rows are changed.
+        moved = {task_uuid}
+        del row_tasks[old_row]
+        for other_row in range(old_row + step, row + step, step):
+            other_uuid = row_tasks.pop(other_row, None)
+            if other_uuid is None:
+                continue
+            self._tasks[other_uuid]["row"] = other_row - step
+            row_tasks[other_row - step] = other_uuid
+            moved.add(other_uuid)
 
         task_data["row"] = row
+        row_tasks[row] = task_uuid
 
-        self.task_edit_controller.update_task(task_data)
+        # Queue the moved tasks to be saved, so that they are sent in one request
+        # along with any other changes the caller makes to them.
+        self._unsaved_tasks.update(moved)
+        self.schedule_render()
 
-        self.render()
+        self.render_tasks(moved)
 
     def dependency_updated(self, data: list) -> None:
         """
@@ -721,66 +1037,148 @@ class ProjectViewController(BaseController):
                 # then shift the destination task and its dependencies to start
                 # a day after the source task ends.
                 shift = source_task["end_date"] - destination_task["start_date"]
-                def recursive_shift(task_uuid: int, parent_task: dict = None) -> None:
+                dependents = self._get_dependents_in_order(destination_task_uuid)
+                # Each task is shifted exactly once, even if it is reached
+                # through more than one dependency.
+                for task_uuid in dependents:
                     task = self._tasks[task_uuid]
                     task["start_date"] = task["start_date"] + shift
                     task["end_date"] = task["end_date"] + shift
-
-                    if not parent_task is None:
-                        if task["row"] <= parent_task["row"]:
-                            self.change_task_row(task_uuid, parent_task["row"])
-
-                    self.task_edit_controller.update_task(task)
-                    for dependency in task["dependencies"]:
-                        recursive_shift(dependency, task)
-                recursive_shift(destination_task_uuid)
-
-        self.task_edit_controller.update_task(source_task)
-        self.task_edit_controller.update_task(destination_task)
-
-        self.render()
+                for task_uuid in dependents:
+                    parent_task = self._tasks[task_uuid]
+                    for dependency in parent_task["dependencies"]:
+                        if self._tasks[dependency]["row"] <= parent_task["row"]:
+                            self.change_task_row(dependency, parent_task["row"])
+
+                self._unsaved_tasks.update(dependents)
+
+        # Queue the changed tasks to be saved along with the render, all in one
+        # request.
+        self._unsaved_tasks.add(source_task_uuid)
+        self._unsaved_tasks.add(destination_task_uuid)
+        self.schedule_render()
         self.set_history_checkpoint()
 
     def set_history_checkpoint(self) -> None:
         """
         Set a checkpoint in the history for the undo/redo system.
+
+        Rather than a copy of every task, each checkpoint only holds the tasks
+        (and project data) that have changed since the previous checkpoint,
+        with their data before and after the change. They are compared and
+        stored serialised as JSON, so that later changes to the tasks do not
+        affect the history.
+
+        Nothing is added if nothing has changed since the current checkpoint.
         """
+        tasks_json = {task_uuid: orjson.dumps(task, option=orjson.OPT_SORT_KEYS) for task_uuid, task in self._tasks.items()}
+        project_json = orjson.dumps(self._project_data, option=orjson.OPT_SORT_KEYS)
+
+        # The tasks that have been created, updated or deleted since the
+        # current checkpoint.
+        task_changes = {}
+        for task_uuid, task_json in tasks_json.items():
+            previous_json = self._history_tasks.get(task_uuid)
+            if previous_json != task_json:
+                task_changes[task_uuid] = (previous_json, task_json)
+        for task_uuid in self._history_tasks.keys() - tasks_json.keys():
+            task_changes[task_uuid] = (self._history_tasks[task_uuid], None)
+
+        project_change = None
+        if project_json != self._history_project:
+            project_change = (self._history_project, project_json)
+
+        if self._history and not task_changes and project_change is None:
+            return
+
         if self._history_index != len(self._history) - 1:
             # If the history index is not the latest.
-            self._history = self._history[:self._history_index+1]
-            self._history_index = len(self._history) - 1
+            self._history.truncate(self._history_index+1)
 
-        self._history.append((deepcopy(self._project_data), deepcopy(self._tasks)))
-
-        # Truncate to a max of 500 history items.
-        if len(self._history) > 500:
-            self._history = self._history[-500:]
+        # Once the history is full, the oldest checkpoint is overwritten. The
+        # first remaining checkpoint is only ever redone to, so it does not
+        # need the changes before it.
+        self._history.append((project_change, task_changes))
+        self._history_tasks = tasks_json
+        self._history_project = project_json
 
         self._history_index = len(self._history) - 1
 
-    def _make_changes(self, history_index: int) -> None:
+    def _make_changes(self, history_index: int, undo: bool) -> None:
         """
-        Make changes to the project data and tasks based on the history index.
+        Make changes to the project data and tasks based on a checkpoint in
+        the history, either undoing or redoing its changes.
+
+        Only the tasks changed by the checkpoint are sent to the server.
+        Deleted tasks are restored by updating them, which creates them again
+        with the same UUID.
 
         Args:
-            history_index (int): The history index to make changes based on.
+            history_index (int): The index of the checkpoint.
+            undo (bool): Whether to undo the checkpoint's changes, restoring the
+                data from before them, rather than redo them.
+        """
+        project_change, task_changes = self._history[history_index]
+        # The side of each change, (before, after), to restore.
+        side = 0 if undo else 1
+
+        if project_change is not None:
+            self._history_project = project_change[side]
+            self._project_data = orjson.loads(self._history_project)
+
+        for task_uuid, change in task_changes.items():
+            task_json = change[side]
+            if task_json is None:
+                self._history_tasks.pop(task_uuid, None)
+                if self._tasks.pop(task_uuid, None) is not None:
+                    self._unsaved_tasks.discard(task_uuid)
+                    self._deleted_tasks.add(task_uuid)
+                continue
+
+            # Loading the checkpoint creates new objects, so the history itself
+            # is never changed.
+            self._history_tasks[task_uuid] = task_json
+            self._tasks[task_uuid] = orjson.loads(task_json)
+            self._deleted_tasks.discard(task_uuid)
+            self._unsaved_tasks.add(task_uuid)
+
+        # The restored tasks may be in different rows.
+        self._row_tasks = None
+
+        # The changes are sent to the server along with the render, so that
+        # undoing or redoing several times at once only sends each task once.
+        self.schedule_render()
+
+    def schedule_render(self) -> None:
         """
-        new_project_data, new_tasks = self._history[history_index]
+        Render the project view once control returns to the event loop, rather
+        than straight away. Any other renders scheduled before then are done
+        by the same render.
+        """
+        if not self._render_timer.isActive():
+            self._render_timer.start()
 
-        for task in new_tasks.values():
-            self.task_edit_controller.update_task(task)
-        
-        for old_task in self._tasks:
-            if not old_task in new_tasks:
-                self.task_edit_controller.delete_task(old_task)
-        
-        for task in new_tasks:
-            if not task in self._tasks:
-                self.task_edit_controller.create_task(new_tasks[task])
+    def _on_render_timer(self) -> None:
+        """
+        A callback function for when a scheduled render is due, see
+        .schedule_render().
+        """
+        self._save_changes()
+        self.render()
 
-        self._project_data, self._tasks = deepcopy(new_project_data), deepcopy(new_tasks)
+    def _save_changes(self) -> None:
+        """
+        Send the tasks changed or deleted since the last save to the server, the
+        changed tasks all in one request.
+        """
+        updated_tasks = [self._tasks[task_uuid] for task_uuid in self._unsaved_tasks if task_uuid in self._tasks]
+        if updated_tasks:
+            self.task_edit_controller.update_tasks(updated_tasks)
+        for task_uuid in self._deleted_tasks:
+            self.task_edit_controller.delete_task(task_uuid)
 
-        self.render()
+        self._unsaved_tasks.clear()
+        self._deleted_tasks.clear()
 
     def undo(self) -> None:
         """
@@ -788,7 +1186,7 @@ class ProjectViewController(BaseController):
         """
         if self._history_index > 0:
             self._history_index -= 1
-            self._make_changes(self._history_index)
+            self._make_changes(self._history_index + 1, undo=True)
 
     def redo(self) -> None:
         """
@@ -796,7 +1194,7 @@ class ProjectViewController(BaseController):
         """
         if self._history_index < len(self._history) - 1:
             self._history_index += 1
-            self._make_changes(self._history_index)
+            self._make_changes(self._history_index, undo=False)
 
     def export(self) -> None:
         """
@@ -812,19 +1210,6 @@ class ProjectViewController(BaseController):
 
         image.save(file_path)
 
-    def _on_vertical_scrollbar_updated(self, value: int) -> None:
-        """
-        A callback function for when the vertical scrollbar is updated.
-
-        This function is used to sync the vertical scrollbars of the task list
-        and the timeline.
-
-        Args:
-            value (int): The new value of the vertical scrollbar.
-        """
-        self._view.tasks.verticalScrollBar().setValue(value)
-        self._view.timeline.verticalScrollBar().setValue(value)
-
     def _connect_signals(self) -> None:
         # Bind menu bar actions.
         self._view.logout_action.triggered.connect(self._client.logout)
@@ -844,14 +1229,26 @@ class ProjectViewController(BaseController):
         self._view.undo_action.triggered.connect(self.undo)
         self._view.redo_action.triggered.connect(self.redo)
 
+        # Render at most once per pass of the event loop, see
+        # .schedule_render().
+        self._render_timer = QTimer(self._view)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(0)
+        self._render_timer.timeout.connect(self._on_render_timer)
+
         # Bind export.
         self._view.export_action.triggered.connect(self.export)
 
         # Syncing scrollbars.
         # This is to ensure that the vertical scrollbars of the task list and
-        # the timeline are in sync.
-        self._view.tasks.verticalScrollBar().valueChanged.connect(self._on_vertical_scrollbar_updated)
-        self._view.timeline.verticalScrollBar().valueChanged.connect(self._on_vertical_scrollbar_updated)
+        # the timeline are in sync. Each scrollbar sets the other's value
+        # directly, without calling back into Python for every scroll step.
+        # Setting a scrollbar to the value it already has does not emit
+        # valueChanged, so the two do not keep updating each other.
+        tasks_scrollbar = self._view.tasks.verticalScrollBar()
+        timeline_scrollbar = self._view.timeline.verticalScrollBar()
+        tasks_scrollbar.valueChanged.connect(timeline_scrollbar.setValue)
+        timeline_scrollbar.valueChanged.connect(tasks_scrollbar.setValue)
 
         # Shortcuts
         self._view.new_task_action.setShortcut(QKeySequence("Ctrl+T"))
@@ -863,6 +1260,8 @@ class RowLabel(QFrame):
     """
     A row label for the task list on the left side of the project view.
     """
+    ui_path = str(_UI_DIR / "project_view_task_item.ui")
+
     def __init__(self, *args, **kwargs) -> None:
         """Class initialisation."""
         super().__init__(*args, **kwargs)
@@ -870,7 +1269,7 @@ class RowLabel(QFrame):
         self._load_ui()
 
     def _load_ui(self) -> None:
-        uic.loadUi(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui\\project_view_task_item.ui"), self)
+        load_ui(self.ui_path, self)
         
     def set_task_data(self, name: str, start: datetime, end: datetime, completed: bool) -> None:
         """
@@ -13,4 +13,6 @@ CELL_WIDTH = 80
 CELL_HEIGHT = 35
 
 EVEN_COLUMN_COLOUR = "#0f1425"
-ODD_COLUMN_COLOUR = "#222b4e"
\ No newline at end of file
+ODD_COLUMN_COLOUR = "#222b4e"
+# The maximum number of checkpoints kept for undo/redo.
+HISTORY_LENGTH = 500
@@ -61,9 +61,16 @@ def export_project(project_data: dict, tasks: dict) -> Image:
     Returns:
         Image: The image of the project.
     """
+    # Convert the dates of each task once, as they are needed for both the
+    # task rows and the dependency lines.
+    task_dates = {
+        task_uuid: (datetime.fromtimestamp(task["start_date"]), datetime.fromtimestamp(task["end_date"]))
+        for task_uuid, task in tasks.items()
+    }
+
     if tasks:
-        project_start_date = datetime.fromtimestamp(min([task["start_date"] for task in tasks.values()]))
-        project_end_date = datetime.fromtimestamp(max([task["end_date"] for task in tasks.values()]))
+        project_start_date = min(start_date for start_date, _ in task_dates.values())
+        project_end_date = max(end_date for _, end_date in task_dates.values())
     else:
         project_start_date = datetime.now()
         project_end_date = datetime.now()
@@ -92,9 +99,8 @@ def export_project(project_data: dict, tasks: dict) -> Image:
     for day in range(days):
         create_cell(image_draw, tuple(np.add(timeline_position, (CELL_WIDTH*day, 0))), (project_start_date + timedelta(days=day)).strftime("%d/%m"), EVEN_COLUMN_COLOUR)
 
-    for row, task in enumerate(sorted(tasks.values(), key=lambda x: x["row"])):
-        start_date = datetime.fromtimestamp(task["start_date"])
-        end_date = datetime.fromtimestamp(task["end_date"])
+    for row, (task_uuid, task) in enumerate(sorted(tasks.items(), key=lambda x: x[1]["row"])):
+        start_date, end_date = task_dates[task_uuid]
 
         image_draw.rectangle([tuple(np.add(grid_position, (0, CELL_HEIGHT*(row+1)))), tuple(np.add(grid_position, (TASK_ROW_WIDTH, CELL_HEIGHT*(row+2))))] , fill=ODD_COLUMN_COLOUR, outline=CELL_BORDER_COLOUR, width=2)
         image_draw.text(np.add(grid_position, (10, 4 + CELL_HEIGHT*(row+1))), task["name"], "green" if task["completed"] else "white", CELL_FONT)
@@ -107,14 +113,14 @@ def export_project(project_data: dict, tasks: dict) -> Image:
         image_draw.rounded_rectangle([tuple(np.add(tuple(np.add(timeline_position, (0, CELL_HEIGHT*(row+1)))), (CELL_WIDTH*column, 0))), tuple(np.add(timeline_position, (CELL_WIDTH*column + CELL_WIDTH*task_length, CELL_HEIGHT*(row+2))))] , fill=task["colour"], outline=CELL_TASK_BORDER_COLOUR, width=2, radius=7)                                 
 
     # Draw lines between the parent tasks and its children.
-    for task in tasks.values():
+    for task_uuid, task in tasks.items():
         task_row = task["row"]
-        task_column = (datetime.fromtimestamp(task["end_date"]) - project_start_date).days
+        task_column = (task_dates[task_uuid][1] - project_start_date).days
 
         for dependency_uuid in task["dependencies"]:
             dependency = tasks[dependency_uuid]
             dependency_row = dependency["row"]
-            dependency_column = (datetime.fromtimestamp(dependency["start_date"]) - project_start_date).days
+            dependency_column = (task_dates[dependency_uuid][0] - project_start_date).days
 
             start = tuple(np.add(timeline_position, (CELL_WIDTH*dependency_column, CELL_HEIGHT*(dependency_row+1) + CELL_HEIGHT//2)))
             end = tuple(np.add(timeline_position, (CELL_WIDTH*task_column, CELL_HEIGHT*(task_row+1) + CELL_HEIGHT//2)))
@@ -0,0 +1,79 @@
+"""
+history.py
+Fixed-size storage for the undo/redo history of the project view.
+@jasonyi
+Created 15/10/2026
+"""
+
+
+class HistoryRing():
+    """
+    A list of history checkpoints with a maximum length, stored in a ring of
+    slots that is allocated once.
+
+    Once it is full, appending a checkpoint overwrites the oldest one, and
+    truncating it only forgets the later checkpoints, so neither has to copy
+    the checkpoints the way slicing a list would.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Class initialisation.
+
+        Args:
+            capacity (int): The maximum number of checkpoints.
+        """
+        self._entries = [None] * capacity
+        self._capacity = capacity
+        # The slot of the oldest checkpoint, and the number of checkpoints.
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> object:
+        """
+        Get a checkpoint, counting from the oldest.
+
+        Args:
+            index (int): The index of the checkpoint.
+
+        Returns:
+            object: The checkpoint.
+        """
+        if not 0 <= index < self._size:
+            raise IndexError("history index out of range")
+        return self._entries[(self._head + index) % self._capacity]
+
+    def append(self, entry: object) -> None:
+        """
+        Add a checkpoint after the latest one, overwriting the oldest
+        checkpoint if there is no room left.
+
+        Args:
+            entry (object): The checkpoint.
+        """
+        self._entries[(self._head + self._size) % self._capacity] = entry
+        if self._size == self._capacity:
+            self._head = (self._head + 1) % self._capacity
+        else:
+            self._size += 1
+
+    def truncate(self, size: int) -> None:
+        """
+        Forget every checkpoint after the first few.
+
+        Args:
+            size (int): The number of checkpoints to keep.
+        """
+        for index in range(size, self._size):
+            self._entries[(self._head + index) % self._capacity] = None
+        self._size = min(self._size, size)
+
+    def clear(self) -> None:
+        """
+        Forget every checkpoint.
+        """
+        self.truncate(0)
+        self._head = 0
@@ -5,7 +5,6 @@ Draws inheritance arrows between classes in the project view.
 Created 17/06/2024
 """
 
-import math, sys
 from PyQt6 import QtWidgets, QtCore, QtGui
 
 from .config import (
@@ -13,154 +12,89 @@ from .config import (
     CELL_WIDTH,
 )
 
+# The size of the arrow head at the end of each arrow.
+ARROW_HEIGHT = 5
+ARROW_WIDTH = 4
 
-class Path(QtWidgets.QGraphicsPathItem):
-    def __init__(self, source: QtCore.QPointF = None, destination: QtCore.QPointF = None, *args, **kwargs):
-        super(Path, self).__init__(*args, **kwargs)
 
-        # Set endpoints.
-        self._source_point = source
-        self._destination_point = destination
+class ArrowCanvas(QtWidgets.QWidget):
+    """
+    A transparent widget over the timeline grid that every arrow is painted on,
+    rather than each arrow being a widget of its own.
 
-        # Set arrow head properties.
-        self._arrow_height = 5
-        self._arrow_width = 4
+    Only the arrows within the area being repainted are painted.
+    """
 
-    def set_source(self, point: QtCore.QPointF):
+    def __init__(self, parent: QtWidgets.QWidget = None) -> None:
         """
-        Set the source point of the path.
+        Class initialisation.
 
         Args:
-            point (QtCore.QPointF): The source point.
+            parent (QtWidgets.QWidget, optional): The parent widget. Defaults to
+                None.
         """
-        self._source_point = point
+        super().__init__(parent)
 
-    def set_destination(self, point: QtCore.QPointF):
+        self._arrows = []
+
+        # Let mouse and drag events through to the timeline grid underneath.
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+
+    def add_arrow(self, arrow: "Arrow") -> None:
         """
-        Set the destination point of the path.
+        Add an arrow to be painted on the canvas.
 
         Args:
-            point (QtCore.QPointF): The destination point.
-        """
-        self._destination_point = point
-    
-    def square_path(self):
+            arrow (Arrow): The arrow.
         """
-        Returns a right-angled path between the source and destination points.
-        """
-        s = self._source_point
-        d = self._destination_point
-
-        path = QtGui.QPainterPath(QtCore.QPointF(s.x(), s.y()))
-        # path.lineTo(d.x(), 0)
-        path.lineTo(s.x(), d.y())
-        path.lineTo(d.x(), d.y())
+        self._arrows.append(arrow)
 
-        return path
-    
-    def calculate_arrow(self, start_point=None, end_point=None):
-        """
-        Calculates the arrow head at the end of the path.
+    def remove_arrow(self, arrow: "Arrow") -> None:
         """
-        try:
-            start_point, end_point = start_point, end_point
-
-            if start_point is None:
-                start_point = self._source_point
-
-            if end_point is None:
-                end_point = self._destination_point
-
-            dx, dy = start_point.x() - end_point.x(), start_point.y() - end_point.y()
-
-            leng = math.sqrt(dx ** 2 + dy ** 2)
-            norm_x, norm_y = dx / leng, dy / leng  # normalize
-
-            norm_x = 0
-            norm_y = -1
-
-            # perpendicular vector
-            perp_x = -norm_y
-            perp_y = norm_x
+        Remove an arrow from the canvas, and repaint where it was.
 
-            left_x = end_point.x() + self._arrow_height * norm_x + self._arrow_width * perp_x
-            left_y = end_point.y() + self._arrow_height * norm_y + self._arrow_width * perp_y
-
-            right_x = end_point.x() + self._arrow_height * norm_x - self._arrow_width * perp_x
-            right_y = end_point.y() + self._arrow_height * norm_y - self._arrow_width * perp_y
-
-            point2 = QtCore.QPointF(left_x, left_y)
-            point3 = QtCore.QPointF(right_x, right_y)
-
-            return QtGui.QPolygonF([point2, end_point, point3])
+        Args:
+            arrow (Arrow): The arrow.
+        """
+        self._arrows.remove(arrow)
+        self.update(arrow.rect)
 
-        except (ZeroDivisionError, Exception):
-            return None
+    def paintEvent(self, paint_event: QtGui.QPaintEvent) -> None:
+        rect = paint_event.rect()
 
-    def paint(self, painter: QtGui.QPainter, option, widget=None) -> None:
+        painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
-
-        painter.pen().setWidth(2)
         painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+        for arrow in self._arrows:
+            if arrow.rect.intersects(rect):
+                arrow.paint(painter)
+        painter.end()
 
-        path = self.square_path()
-        painter.drawPath(path)
-        self.setPath(path)
-
-        triangle_source = self.calculate_arrow(path.pointAtPercent(0.1), self._source_point)  # change path.PointAtPercent() value to move arrow on the line
-
-        if triangle_source is not None:
-            painter.drawPolyline(triangle_source)
-
-class ViewPort(QtWidgets.QGraphicsView):
-    def __init__(self):
-        super(ViewPort, self).__init__()
-
-        self.setViewportUpdateMode(QtWidgets.QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
-
-        self._is_drawing_path = False
-        self._current_path = None
-
-    def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
-        if event.button() == QtCore.Qt.MouseButton.LeftButton:
-            pos = self.mapToScene(event.pos())
-            self._is_drawing_path = True
-            self._current_path = Path(source=pos, destination=pos)
-            self.scene().addItem(self._current_path)
-
-            return
-
-        super(ViewPort, self).mousePressEvent(event)
+class Arrow():
+    """
+    An arrow from the end of a task to the start of a task that depends on it,
+    painted on an ArrowCanvas.
 
-    def mouseMoveEvent(self, event):
-        pos = self.mapToScene(event.pos())
+    The arrow covers the grid cells from the cell after the source, up to the
+    row before and the column of the destination.
+    """
 
-        if self._is_drawing_path:
-            self._current_path.set_destination(pos)
-            self.scene().update(self.sceneRect())
-            return
+    def __init__(self, canvas: ArrowCanvas):
+        self._canvas = canvas
+        self.rect = QtCore.QRect()
+        self._path = None
+        self._arrow_head = None
+        # The cells the arrow was last drawn between.
+        self._cells = None
 
-        super(ViewPort, self).mouseMoveEvent(event)
+        canvas.add_arrow(self)
 
-    def mouseReleaseEvent(self, event: QtGui.QMouseEvent) -> None:
-        pos = self.mapToScene(event.pos())
-
-        if self._is_drawing_path:
-            self._current_path.set_destination(pos)
-            self._is_drawing_path = False
-            self._current_path = None
-            self.scene().update(self.sceneRect())
+    def set_source_destination(self, source_row: int, source_column: int, destination_row: int, destination_column: int):
+        # Nothing needs to be repainted if the arrow has not moved.
+        if self._cells == (source_row, source_column, destination_row, destination_column):
             return
+        self._cells = (source_row, source_column, destination_row, destination_column)
 
-        super(ViewPort, self).mouseReleaseEvent(event)
-    
-class Arrow():
-    def __init__(self, parent: QtWidgets.QWidget):
-        self._scene = QtWidgets.QGraphicsScene()
-        self._view = QtWidgets.QGraphicsView(self._scene)
-        self._parent = parent
-
-    def set_source_destination(self, source_row: int, source_column: int, destination_row: int, destination_column: int):
         self._source_row = source_row
         self._source_column = source_column
 
@@ -173,25 +107,57 @@ class Arrow():
         self._draw()
 
     def _draw(self):
-        try:
-            self._scene.clear()
-            self._parent.layout().addWidget(self._view, self._source_row, self._source_column+1, self._row_span, self._column_span)
-
-            path = Path()
-            path._source_point = QtCore.QPointF()
-            path._source_point.setX((CELL_WIDTH*(self._column_span-1)) + CELL_WIDTH//2)
-            path._source_point.setY(CELL_HEIGHT*self._row_span)
-            path._destination_point = QtCore.QPointF()
-            path._destination_point.setX(0)
-            path._destination_point.setY(CELL_HEIGHT//2)
-            self._scene.addItem(path)
-
-            self._view.setMaximumSize(CELL_WIDTH*self._column_span, CELL_HEIGHT*self._row_span)
-            self._view.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            self._view.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            self._view.setStyleSheet("background: transparent; border: none;")
-            self._view.setSceneRect(0, 0, CELL_WIDTH*self._column_span, CELL_HEIGHT*self._row_span)
-        except Exception as e:
-            print(f"Failed to draw arrow: {e}")
-
-        self._view.show()
+        """
+        Calculate the path of the arrow, and repaint the canvas where the arrow
+        was and now is.
+        """
+        previous_rect = self.rect
+
+        if self._row_span < 1 or self._column_span < 1:
+            # The destination is not after the source, so there is no arrow to
+            # draw.
+            self.rect = QtCore.QRect()
+            self._path = None
+            self._arrow_head = None
+        else:
+            left = (self._source_column+1) * CELL_WIDTH
+            top = self._source_row * CELL_HEIGHT
+            self.rect = QtCore.QRect(left, top, CELL_WIDTH*self._column_span, CELL_HEIGHT*self._row_span)
+
+            # A right-angled path from the middle of the source row, to the top
+            # of the destination row above the middle of its first column.
+            source_point = QtCore.QPointF(left, top + CELL_HEIGHT//2)
+            destination_point = QtCore.QPointF(left + (CELL_WIDTH*(self._column_span-1)) + CELL_WIDTH//2, top + CELL_HEIGHT*self._row_span)
+
+            self._path = QtGui.QPainterPath(destination_point)
+            self._path.lineTo(destination_point.x(), source_point.y())
+            self._path.lineTo(source_point)
+
+            # The arrow head points down at the destination.
+            self._arrow_head = QtGui.QPolygonF([
+                QtCore.QPointF(destination_point.x() + ARROW_WIDTH, destination_point.y() - ARROW_HEIGHT),
+                destination_point,
+                QtCore.QPointF(destination_point.x() - ARROW_WIDTH, destination_point.y() - ARROW_HEIGHT),
+            ])
+
+        self._canvas.update(previous_rect.united(self.rect))
+
+    def paint(self, painter: QtGui.QPainter) -> None:
+        """
+        Paint the arrow, within the cells it covers.
+
+        Args:
+            painter (QtGui.QPainter): The painter of the canvas.
+        """
+        if self._path is None:
+            return
+
+        painter.setClipRect(self.rect)
+        painter.drawPath(self._path)
+        painter.drawPolyline(self._arrow_head)
+
+    def remove(self) -> None:
+        """
+        Remove the arrow from its canvas.
+        """
+        self._canvas.remove_arrow(self)
@@ -6,18 +6,26 @@ Created 12/06/2024
 """
 
 import os
+from pathlib import Path
 from datetime import datetime, timedelta, timezone
 
 from PyQt6.QtCore import Qt
-from PyQt6 import uic
-from PyQt6.QtNetwork import QNetworkRequest, QNetworkReply, QNetworkReply
-from PyQt6.QtCore import QUrl
+from PyQt6.QtNetwork import QNetworkReply
 from PyQt6.QtWidgets import QWidget, QMainWindow, QPushButton
 
 from utils.window.controller_base import BaseController
-from utils.server_response import get_json_from_reply, to_json_data, handle_new_response_payload
+from utils.window.ui_loader import load_ui
+from utils.server_response import get_json_from_reply, to_json_data, handle_new_response_payload, create_endpoint
 from utils.dialog import create_message_dialog, create_calender_dialog
 
+# The endpoints are constant for the whole process, so build them once.
+_NEW_TASK_ENDPOINT = create_endpoint("/project/task/new")
+_UPDATE_TASK_ENDPOINT = create_endpoint("/project/task/update")
+_UPDATE_TASKS_ENDPOINT = create_endpoint("/project/task/update-many")
+_DELETE_TASK_ENDPOINT = create_endpoint("/project/task/delete")
+
+_UI_DIR = Path(__file__).resolve().parent / "ui"
+
 PROJECTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "user_projects")
 MAX_PROJECTS_COLUMNS = 3
 DEFAULT_COLOUR = "#ffffff"
@@ -25,7 +33,7 @@ DEFAULT_COLOUR = "#ffffff"
 
 class TaskEditWindow(QMainWindow):
     """Project view class."""
-    ui_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui\\task_edit_window.ui")
+    ui_path = str(_UI_DIR / "task_edit_window.ui")
 
     def __init__(self, parent: QWidget) -> None:
         """Class initialisation."""
@@ -41,7 +49,7 @@ class TaskEditWindow(QMainWindow):
         Returns:
             QWidget: A QMainWindow object.
         """
-        return uic.load_ui.loadUi(self.ui_path, self)
+        return load_ui(self.ui_path, self)
 
 class TaskEditController(BaseController):
     """Project view controller class."""
@@ -135,7 +143,7 @@ class TaskEditController(BaseController):
         
         Also highlight the selected colour.
         """
-        for button in self._view.palette_buttons.findChildren(QPushButton):
+        for button in self._palette_buttons:
             button_colour = button.property("colour")
             if self.colour == button_colour:
                 # This is when the user has selected this colour.
@@ -145,17 +153,10 @@ class TaskEditController(BaseController):
                 button.setStyleSheet(f"background-color: {button_colour};")
 
     def _setup_endpoints(self) -> None:
-        self._new_task = QNetworkRequest()
-        self._new_task.setUrl(QUrl(f"{os.getenv('SERVER_ADDRESS')}/project/task/new"))
-        self._new_task.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
-
-        self._update_task = QNetworkRequest()
-        self._update_task.setUrl(QUrl(f"{os.getenv('SERVER_ADDRESS')}/project/task/update"))
-        self._update_task.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
-
-        self._delete_task = QNetworkRequest()
-        self._delete_task.setUrl(QUrl(f"{os.getenv('SERVER_ADDRESS')}/project/task/delete"))
-        self._delete_task.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
+        self._new_task = _NEW_TASK_ENDPOINT
+        self._update_task = _UPDATE_TASK_ENDPOINT
+        self._update_tasks = _UPDATE_TASKS_ENDPOINT
+        self._delete_task = _DELETE_TASK_ENDPOINT
     
     def _handle_error(self, reply: QNetworkReply, error: QNetworkReply.NetworkError) -> None:
         """
@@ -189,8 +190,6 @@ class TaskEditController(BaseController):
         if reply.error() != QNetworkReply.NetworkError.NoError:
             return self._handle_error(reply, reply.error())
         
-        reply.deleteLater()
-
         payload = get_json_from_reply(reply)
         handle_new_response_payload(self._client, payload)
 
@@ -244,14 +243,26 @@ class TaskEditController(BaseController):
         if reply.error() != QNetworkReply.NetworkError.NoError:
             return self._handle_error(reply, reply.error())
         
-        reply.deleteLater()
-
         payload = get_json_from_reply(reply)
         handle_new_response_payload(self._client, payload)
 
         if self._view.isVisible():
             self._view.hide()
     
+    def _on_tasks_updated_response(self, reply: QNetworkReply) -> None:
+        """
+        A callback function for when several tasks have been updated at once.
+
+        Args:
+            reply (QNetworkReply): The reply object from the server.
+        """
+        # Do not proceed if there was an error.
+        if reply.error() != QNetworkReply.NetworkError.NoError:
+            return self._handle_error(reply, reply.error())
+        
+        payload = get_json_from_reply(reply)
+        handle_new_response_payload(self._client, payload)
+
     def _on_task_deleted_response(self, reply: QNetworkReply) -> None:
         """
         A callback function for when a task is deleted.
@@ -263,8 +274,6 @@ class TaskEditController(BaseController):
         if reply.error() != QNetworkReply.NetworkError.NoError:
             return self._handle_error(reply, reply.error())
         
-        reply.deleteLater()
-
         payload = get_json_from_reply(reply)
         handle_new_response_payload(self._client, payload)
 
@@ -290,7 +299,26 @@ class TaskEditController(BaseController):
                 }
             )
         )
-        reply.finished.connect(lambda: self._on_task_updated_response(reply))
+        self._bind_reply(reply, self._on_task_updated_response)
+
+    def update_tasks(self, tasks_data: list[dict]) -> None:
+        """
+        Submit the data of several tasks to the server in one request.
+
+        Args:
+            tasks_data (list[dict]): The data of each task to submit.
+        """
+        reply: QNetworkReply = self._network_manager.post(
+            self._update_tasks,
+            to_json_data(
+                {
+                    "access_token": self._client.cache["access_token"],
+                    "project_uuid": self._client.main_window.project_view_controller._project_data["_id"],
+                    "tasks_data": tasks_data
+                }
+            )
+        )
+        self._bind_reply(reply, self._on_tasks_updated_response)
 
     def delete_task(self, task_uuid: str) -> None:
         """
@@ -309,7 +337,7 @@ class TaskEditController(BaseController):
                 }
             )
         )
-        reply.finished.connect(lambda: self._on_task_deleted_response(reply))
+        self._bind_reply(reply, self._on_task_deleted_response)
 
     def new_task(self, task_uuid: str) -> None:
         """
@@ -328,7 +356,7 @@ class TaskEditController(BaseController):
                 }
             )
         )
-        reply.finished.connect(lambda: self._on_new_task_response(reply))
+        self._bind_reply(reply, self._on_new_task_response)
 
     def _prompt_calender(self, field: str) -> None:
         """
@@ -354,7 +382,7 @@ class TaskEditController(BaseController):
                     # Ensure the end date is always after the start date.
                     self.start_date = self.end_date - timedelta(days=1).total_seconds()
 
-            if self._task_data and (datetime.fromtimestamp(self.start_date) - self._client.main_window.project_view_controller.start_date).days < self._client.main_window.project_view_controller._task_items[self._task_data["task_uuid"]].min_column:
+            if self._task_data and self._client.main_window.project_view_controller._get_column(self.start_date) < self._client.main_window.project_view_controller._task_items[self._task_data["task_uuid"]].min_column:
                 # The start date cannot be before the parent task's end date.
                 self.start_date = self._client.main_window.project_view_controller.start_date.timestamp() + self._client.main_window.project_view_controller._task_items[self._task_data["task_uuid"]].min_column * 24 * 60 * 60
                 create_message_dialog(self._view, "Error", f"Cannot have a start date that is before the parent task's end date ({datetime.fromtimestamp(self.start_date).strftime('%d/%m/%y')}).").exec()
@@ -378,7 +406,10 @@ class TaskEditController(BaseController):
 
             return set_colour
 
-        for button in self._view.palette_buttons.findChildren(QPushButton):
+        # The colour options are fixed, so only look them up once rather than
+        # each time a colour is selected.
+        self._palette_buttons = self._view.palette_buttons.findChildren(QPushButton)
+        for button in self._palette_buttons:
             button.clicked.connect(_button_callback(button.property("colour")))
 
     def _connect_signals(self) -> None:
@@ -30,10 +30,11 @@ class TimelineTaskItem(DragItem):
         super().__init__(*args, **kwargs)
 
         self.task_uuid = task_uuid
+        self._colour = None
         self.set_name(task_name)
+        # Also sets the style sheet.
         self.set_colour(colour)
         
-        self.reset_style_sheet()
         self.setMinimumSize(CELL_WIDTH, CELL_HEIGHT)
 
     def reset_style_sheet(self) -> None:
@@ -87,7 +88,12 @@ class TimelineTaskItem(DragItem):
         Args:
             colour (str): The colour of the task item.
         """
-        self._colour = QColor(colour)
+        colour = QColor(colour)
+        if colour == self._colour:
+            # The style sheet is only parsed again if the colour has changed.
+            return
+
+        self._colour = colour
         self._colour_r, self._colour_g, self._colour_b = self._colour.red(), self._colour.green(), self._colour.blue()
         self.reset_style_sheet()
 
@@ -9,8 +9,12 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 import PyQt6.QtCore as QtCore
-from PyQt6.QtCore import Qt, QMimeData, pyqtSignal
+from PyQt6.QtCore import Qt, QMimeData, QRect, pyqtSignal
 from PyQt6.QtGui import (
+    QColor,
+    QFont,
+    QPainter,
+    QPaintEvent,
     QPixmap,
     QDrag,
     QDragMoveEvent,
@@ -30,6 +34,15 @@ from .config import (
 if TYPE_CHECKING:
     from projects.view.task_items import TimelineTaskItem, TimelineMilestoneItem
 
+# The colours of the timeline columns, see TimelineBackground.
+_EVEN_COLUMN_COLOUR = QColor(EVEN_COLUMN_COLOUR)
+_ODD_COLUMN_COLOUR = QColor(ODD_COLUMN_COLOUR)
+# The colours of the date headers, see TimelineDates.
+_DATE_BORDER_COLOUR = QColor("#979ea8")
+_DATE_TEXT_COLOUR = QColor("#ffffff")
+# The width of the border around each date header.
+DATE_BORDER_WIDTH = 2
+
 def set_timeline_objects(task, milestone) -> None:
     global TimelineTaskItem
     global TimelineMilestoneItem
@@ -312,6 +325,88 @@ class TimelineGridWidget(QWidget):
             else:
                 item.set_background_colour(ODD_COLUMN_COLOUR)
 
+class TimelineBackground(QWidget):
+    """
+    The background of the timeline grid, with alternating shades of the
+    background colour for each column.
+
+    The columns are painted rather than each being a widget of their own, and
+    only the columns within the area being repainted are painted.
+    """
+
+    def __init__(self, total_columns: int, parent = None) -> None:
+        """
+        Class initialisation.
+
+        Args:
+            total_columns (int): The number of columns in the timeline.
+            parent (QWidget, optional): The parent widget. Defaults to None.
+        """
+        super().__init__(parent)
+
+        self._total_columns = total_columns
+
+    def paintEvent(self, paint_event: QPaintEvent) -> None:
+        rect = paint_event.rect()
+        first = max(0, rect.left() // CELL_WIDTH)
+        last = min(self._total_columns, rect.right() // CELL_WIDTH + 1)
+
+        painter = QPainter(self)
+        for i in range(first, last):
+            colour = _EVEN_COLUMN_COLOUR if i % 2 == 0 else _ODD_COLUMN_COLOUR
+            painter.fillRect(i * CELL_WIDTH, rect.top(), CELL_WIDTH, rect.height(), colour)
+        painter.end()
+
+class TimelineDates(QWidget):
+    """
+    The date headers along the top of the timeline grid, one for each column.
+
+    The dates are painted rather than each being a label of their own, and only
+    the dates within the area being repainted are painted.
+    """
+
+    # The font of the dates, shared by every instance. It is created with the
+    # first instance, as fonts cannot be created before the application.
+    _font = None
+
+    def __init__(self, dates: list[str], parent = None) -> None:
+        """
+        Class initialisation.
+
+        Args:
+            dates (list[str]): The text of the date header for each column.
+            parent (QWidget, optional): The parent widget. Defaults to None.
+        """
+        super().__init__(parent)
+
+        self._dates = dates
+
+        if TimelineDates._font is None:
+            font = QFont()
+            font.setBold(True)
+            font.setFamily("Segoe Ui")
+            font.setPixelSize(14)
+            TimelineDates._font = font
+
+        self.setFixedHeight(CELL_HEIGHT)
+        self.setMinimumWidth(len(dates) * CELL_WIDTH)
+
+    def paintEvent(self, paint_event: QPaintEvent) -> None:
+        rect = paint_event.rect()
+        first = max(0, rect.left() // CELL_WIDTH)
+        last = min(len(self._dates), rect.right() // CELL_WIDTH + 1)
+
+        painter = QPainter(self)
+        painter.setFont(self._font)
+        painter.setPen(_DATE_TEXT_COLOUR)
+        for i in range(first, last):
+            cell = QRect(i * CELL_WIDTH, 0, CELL_WIDTH, CELL_HEIGHT)
+            inner = cell.adjusted(DATE_BORDER_WIDTH, DATE_BORDER_WIDTH, -DATE_BORDER_WIDTH, -DATE_BORDER_WIDTH)
+            painter.fillRect(cell, _DATE_BORDER_COLOUR)
+            painter.fillRect(inner, _EVEN_COLUMN_COLOUR)
+            painter.drawText(inner, Qt.AlignmentFlag.AlignCenter, self._dates[i])
+        painter.end()
+
 class DragTargetIndicator(QLabel):
     """
     A drag target indicator for the timeline grid. This is used to indicate
@@ -0,0 +1,82 @@
+"""
+env_compile.py
+Compiles the client's .env file into a Python module of constants.
+@jasonyi
+Created 15/10/2026
+"""
+
+import os
+import importlib
+import importlib.util
+from types import ModuleType
+
+CLIENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_PATH = os.path.join(CLIENT_DIR, ".env")
+COMPILED_PATH = os.path.join(CLIENT_DIR, "env_constants.py")
+
+
+def _get_env_mtime() -> int:
+    """
+    Get the modification time of the .env file.
+
+    Returns:
+        int: The modification time in nanoseconds, or 0 if there is no .env file.
+    """
+    try:
+        return os.stat(ENV_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+def compile_env() -> None:
+    """
+    Parse the .env file and write its values into the env_constants module.
+
+    Each value is set in os.environ if it is not already set (the same as
+    load_dotenv()), and is also available as a constant e.g.
+    env_constants.SERVER_ADDRESS.
+    """
+    # Only import dotenv when the .env file actually needs to be parsed.
+    from dotenv import dotenv_values
+
+    values = dotenv_values(ENV_PATH) if os.path.exists(ENV_PATH) else {}
+
+    lines = [
+        '"""',
+        "env_constants.py",
+        "Generated from .env by utils/env_compile.py, do not edit.",
+        '"""',
+        "",
+        "import os",
+        "",
+    ]
+    for key, value in values.items():
+        if value is None:
+            continue
+        statement = f"os.environ.setdefault({key!r}, {value!r})"
+        lines.append(f"{key} = {statement}" if key.isidentifier() else statement)
+
+    with open(COMPILED_PATH, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+    # Remove the old bytecode, which may otherwise still be considered up to date
+    # if the module is rewritten within the same second.
+    try:
+        os.remove(importlib.util.cache_from_source(COMPILED_PATH))
+    except FileNotFoundError:
+        pass
+
+def load_env() -> ModuleType:
+    """
+    Load the environment variables from the env_constants module, recompiling it
+    first if it does not exist or the .env file has changed since.
+
+    Returns:
+        ModuleType: The env_constants module.
+    """
+    if not os.path.exists(COMPILED_PATH) or os.stat(COMPILED_PATH).st_mtime_ns < _get_env_mtime():
+        compile_env()
+
+    return importlib.import_module("env_constants")
+
+if __name__ == "__main__":
+    compile_env()
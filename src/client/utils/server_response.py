@@ -7,14 +7,48 @@ Created 18/05/2024
 
 from __future__ import annotations
 from typing import TYPE_CHECKING
-import json
+import os
+import orjson
+from functools import cache
 
 from PyQt6.QtNetwork import QNetworkReply, QNetworkRequest
-from PyQt6.QtCore import QByteArray
+from PyQt6.QtCore import QByteArray, QUrl
+
+# Sets the values from the .env file in os.environ, see utils/env_compile.py.
+import env_constants
 
 if TYPE_CHECKING:
     from app import ClientApplication
 
+# How long an idle connection to the server is kept open for reuse, in seconds.
+CONNECTION_CACHE_EXPIRY = 60
+
+@cache
+def create_endpoint(path: str) -> QNetworkRequest:
+    """
+    Create a request for a JSON endpoint on the server.
+
+    The request allows HTTP/2 and keeps the connection open for reuse, so that
+    requests to the server can share one connection instead of each doing a
+    TCP/TLS handshake.
+
+    Only one request is created per path for the whole process, and is shared
+    between every module that uses the endpoint, so it must not be modified.
+
+    Args:
+        path (str): The path of the endpoint e.g. "/user/authorise".
+
+    Returns:
+        QNetworkRequest: The request object.
+    """
+    # Read from the environment, as the address may be given there rather than
+    # in the .env file.
+    request = QNetworkRequest(QUrl(f"{os.environ['SERVER_ADDRESS']}{path}"))
+    request.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
+    request.setAttribute(QNetworkRequest.Attribute.Http2AllowedAttribute, True)
+    request.setAttribute(QNetworkRequest.Attribute.ConnectionCacheExpiryTimeoutSecondsAttribute, CONNECTION_CACHE_EXPIRY)
+    return request
+
 def get_json_from_reply(reply: QNetworkReply) -> dict | None:
     """
     Get the JSON data from a network reply object.
@@ -26,11 +60,12 @@ def get_json_from_reply(reply: QNetworkReply) -> dict | None:
         dict | None: The JSON data from the reply, or None if the data could not
             be decoded.
     """
-    response_bytes = reply.readAll()
-    response_str = str(response_bytes, "utf-8")  # Convert QByteArray to string
+    # Parse the bytes of the reply directly, rather than decoding them to a
+    # string first.
+    response_bytes = reply.readAll().data()
     try:
-        return json.loads(response_str)
-    except json.JSONDecodeError as e:
+        return orjson.loads(response_bytes)
+    except orjson.JSONDecodeError as e:
         print(f"Failed to decode JSON: {e}")
         return None
 
@@ -45,14 +80,14 @@ def to_json_data(payload: dict) -> QByteArray | None:
         QByteArray | None: The QByteArray object, or None if the data could not
             be encoded.
     """
-    data = QByteArray()
     try:
-        data.append(json.dumps(payload).encode("utf-8"))
-        return data
-    except json.JSONDecodeError as e:
+        encoded = orjson.dumps(payload)
+    except orjson.JSONEncodeError as e:
         print(f"Failed to encode JSON: {e}")
         return None
 
+    return QByteArray(encoded)
+
 def handle_new_response_payload(client: ClientApplication, payload: dict) -> None:
     """
     Handle a new response payload from the server.
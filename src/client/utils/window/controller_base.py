@@ -6,11 +6,10 @@ Created 16/05/2024
 """
 
 from __future__ import annotations
-from typing import TYPE_CHECKING
-
-from PyQt6 import QtCore
+from typing import TYPE_CHECKING, Callable
 
 if TYPE_CHECKING:
+    from PyQt6.QtNetwork import QNetworkReply
     from client.utils.window.page_base import BasePage
     from app import ClientApplication
 
@@ -21,6 +20,9 @@ class BaseController():
     window.
     """
 
+    # __weakref__ is needed for Qt to hold bound methods of the controller as slots.
+    __slots__ = ("_view", "_client", "_network_manager", "__weakref__")
+
     def __init__(self, client: ClientApplication, view: BasePage) -> None:
         """Class initialisation."""
         self._view = view
@@ -48,6 +50,25 @@ class BaseController():
         """
         raise NotImplementedError()
 
+    def _bind_reply(self, reply: QNetworkReply, callback: Callable[[QNetworkReply], None]) -> None:
+        """
+        Call a function with a reply from the server once it has finished.
+
+        Replies are dispatched from the network manager's single finished
+        signal (see ClientApplication._dispatch_reply()), rather than each
+        reply having its own slot connected. The reply is deleted once the
+        callback has returned, so it must not be kept for later.
+
+        Args:
+            reply (QNetworkReply): The reply object from the server.
+            callback (Callable[[QNetworkReply], None]): The function to call
+                with the reply.
+
+        Returns:
+            None
+        """
+        self._client.reply_callbacks[reply] = callback
+
     def show(self) -> None:
         """
         Show the window associated with this controller.
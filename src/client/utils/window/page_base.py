@@ -9,7 +9,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from PyQt6.QtWidgets import QWidget
-from PyQt6 import uic
+
+from utils.window.ui_loader import load_ui
 
 if TYPE_CHECKING:
     from utils.window.controller_base import BaseController
@@ -32,7 +33,7 @@ class BasePage(QWidget):
         Returns:
             QWidget: A QWidget object.
         """
-        return uic.load_ui.loadUi(self.ui_path, self)
+        return load_ui(self.ui_path, self)
     
     def assign_controller(self, controller: BaseController) -> None:
         """
@@ -0,0 +1,158 @@
+"""
+ui_loader.py
+Loads .ui files for windows and pages through pre-compiled Python modules.
+@jasonyi
+Created 15/10/2026
+"""
+
+import os
+import sys
+import hashlib
+import py_compile
+import importlib.util
+
+from PyQt6 import uic
+from PyQt6.QtWidgets import QWidget
+
+# Directory the Python modules compiled from .ui files are cached in, so they
+# persist across launches without being written into the source tree.
+UI_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ganttstudent", "ui")
+# The form classes already loaded in this process, keyed by .ui file path.
+_UI_TYPE_CACHE: dict[str, type] = {}
+
+CLIENT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def get_compiled_path(ui_path: str) -> str:
+    """
+    Get the path of the cached Python module compiled from a .ui file.
+
+    The file name is a hash of the .ui file's path, modification time and size,
+    so a modified .ui file will never be matched with an outdated module.
+
+    Args:
+        ui_path (str): The path to the .ui file.
+
+    Returns:
+        str: The path to the compiled Python module.
+    """
+    ui_path = os.path.abspath(ui_path)
+    stat = os.stat(ui_path)
+    key = hashlib.sha1(f"{ui_path}:{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()
+    name = os.path.splitext(os.path.basename(ui_path))[0]
+
+    return os.path.join(UI_CACHE_DIR, f"{name}_{key}.py")
+
+def compile_ui(ui_path: str) -> str:
+    """
+    Compile a .ui file into a Python module (the same as running pyuic6 on it).
+
+    Args:
+        ui_path (str): The path to the .ui file.
+
+    Returns:
+        str: The path to the compiled Python module.
+    """
+    compiled_path = get_compiled_path(ui_path)
+    os.makedirs(UI_CACHE_DIR, exist_ok=True)
+
+    # Write to a temporary file first, so an interrupted compile never leaves a
+    # partial module in the cache.
+    temp_path = f"{compiled_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        uic.compileUi(ui_path, file)
+    os.replace(temp_path, compiled_path)
+
+    # Compile the module to bytecode now, so that importing it does not have to.
+    py_compile.compile(compiled_path, doraise=False)
+
+    return compiled_path
+
+def _get_form_class(ui_path: str) -> type:
+    """
+    Get the generated form class (Ui_*) for a .ui file.
+
+    The form class is only looked up once per .ui file in each process, so
+    widgets that are created many times (e.g. list items) share it.
+
+    The .ui file is only compiled if there is no cached module for its current
+    version. Otherwise the cached module is imported, which also makes use of
+    Python's bytecode cache.
+
+    Args:
+        ui_path (str): The path to the .ui file.
+
+    Returns:
+        type: The form class with a .setupUi() method.
+    """
+    form_class = _UI_TYPE_CACHE.get(ui_path)
+    if form_class is not None:
+        return form_class
+
+    compiled_path = get_compiled_path(ui_path)
+    if not os.path.exists(compiled_path):
+        compile_ui(ui_path)
+
+    module_name = os.path.splitext(os.path.basename(compiled_path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, compiled_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    # The compiled module contains a single generated class named Ui_<name>.
+    form_class = next(value for name, value in vars(module).items() if name.startswith("Ui_"))
+    _UI_TYPE_CACHE[ui_path] = form_class
+    return form_class
+
+def load_ui(ui_path: str, widget: QWidget) -> QWidget:
+    """
+    Load a .ui file into an existing widget, as a replacement for uic.loadUi().
+
+    Like uic.loadUi(), the child widgets are assigned as attributes of the
+    widget e.g. widget.login_button.
+
+    Args:
+        ui_path (str): The path to the .ui file.
+        widget (QWidget): The widget to create the user interface in.
+
+    Returns:
+        QWidget: The widget given.
+    """
+    form = _get_form_class(ui_path)()
+    form.setupUi(widget)
+
+    # Move the child widgets from the form onto the widget itself, in one
+    # update of its attributes.
+    widget.__dict__.update(vars(form))
+
+    return widget
+
+def preload_ui(*ui_paths: str) -> None:
+    """
+    Load the form classes for .ui files ahead of time, so that the first
+    widget created from each of them does not have to.
+
+    Args:
+        *ui_paths (str): The paths to the .ui files.
+    """
+    for ui_path in ui_paths:
+        try:
+            _get_form_class(ui_path)
+        except Exception as e:
+            print(f"Failed to preload {ui_path}: {e}")
+
+def compile_all(directory: str = CLIENT_DIR) -> None:
+    """
+    Compile every .ui file in a directory and its subdirectories. This is an
+    optional build step, as .ui files are otherwise compiled on first load.
+
+    Args:
+        directory (str, optional): The directory to search for .ui files.
+            Defaults to the client directory.
+    """
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.endswith(".ui"):
+                print(f"Compiled {compile_ui(os.path.join(root, file))}")
+
+if __name__ == "__main__":
+    compile_all(*sys.argv[1:])
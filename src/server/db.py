@@ -6,6 +6,7 @@ Created 14/05/2024
 """
 
 from motor import motor_asyncio
+from pymongo import UpdateOne
 import os
 
 URI = f"mongodb+srv://{{user}}:{{password}}@{{address}}?retryWrites=true&w=majority&appName=Cluster0&tlsAllowInvalidCertificates=true"
@@ -75,6 +76,13 @@ class MongoDB():
 
         return await collection.update_many(target, {'$set': value, '$unset': unset, '$pull': pull, '$inc': inc}, upsert=upsert) #, upsert=True)
     
+    async def update_each(self, db: str, collection: str, updates: list[tuple[dict, dict]]) -> None:
+        db = self.client[db]
+        collection = db[collection]
+
+        # Send every update to the database in one request.
+        return await collection.bulk_write([UpdateOne(target, {'$set': value}, upsert=True) for target, value in updates])
+
     async def count(self, db: str, collection: str, target: dict = {}) -> int:
         db = self.client[db]
         collection = db[collection]
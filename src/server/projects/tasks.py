@@ -19,6 +19,68 @@ if TYPE_CHECKING:
     from app import WebServer
 
 
+def _validate_task_data(server: WebServer, task_data: dict) -> web.Response | None:
+    """
+    Validate the data of an existing task sent by a client, converting the
+    fields to their expected types in place.
+
+    Args:
+        server (WebServer): The web server.
+        task_data (dict): The task data to validate.
+
+    Returns:
+        web.Response | None: The error response if the task data is invalid,
+            otherwise None.
+    """
+    # Validation checks.
+    required_task_data_fields = {
+        "_id": (str, 36*2+1, 36*2+1),
+        "task_uuid": (str, 36, 36),
+        "project_uuid": (str, 36, 36),
+        "task_type": (str, 4, 9),
+        "row": (int,),
+        "name": (str, 1, 20),
+        "description": (str, 0, 1024),
+        "start_date": (int,),
+        "end_date": (int,),
+        "completed": (bool,),
+        "colour": (str, 7, 7),
+        "dependencies": (list,),
+    }
+
+    # Validate that all the required fields are present.
+    for field, validation_info in required_task_data_fields.items():
+        if field in task_data.keys():
+            value = task_data[field]
+            
+            # Type check.
+            try:
+                value = validation_info[0](value)
+                task_data[field] = value
+            except ValueError:
+                return server.json_payload_response(400, {"message": f"Field {field} type in task_data must be {validation_info[0]}, instead got: {type(field)}."})
+            
+            if validation_info[0] is str:
+                # Range check (string length).
+                if len(value) < validation_info[1]:
+                    return server.json_payload_response(400, {"message": f"{field} must be longer than {validation_info[1]} chars."})
+                elif len(value) > validation_info[2]:
+                    return server.json_payload_response(400, {"message": f"{field} must be shorter than {validation_info[1]} chars."})
+        else:
+            return server.json_payload_response(400, {"message": f"Missing field in task_data: {field}."})
+
+    # Validate that there are no extra fields in the task_data.
+    for field in task_data.keys():
+        if field not in required_task_data_fields.keys():
+            return server.json_payload_response(400, {"message": f"Invalid field in task_data: {field}."})
+
+    # Validate that the task_type is valid.
+    if not task_data["task_type"] in ("task", "milestone"):
+        return server.json_payload_response(400, {"message": f"task_type must be one of task or milestone."})
+
+    return None
+
+
 class TasksRoute(WebAppRoutes):
     """Route for registering a new user."""
 
@@ -143,51 +205,9 @@ class TasksRoute(WebAppRoutes):
         if isinstance(body, web.Response):
             return body
         
-        # Validation checks.
-        required_task_data_fields = {
-            "_id": (str, 36*2+1, 36*2+1),
-            "task_uuid": (str, 36, 36),
-            "project_uuid": (str, 36, 36),
-            "task_type": (str, 4, 9),
-            "row": (int,),
-            "name": (str, 1, 20),
-            "description": (str, 0, 1024),
-            "start_date": (int,),
-            "end_date": (int,),
-            "completed": (bool,),
-            "colour": (str, 7, 7),
-            "dependencies": (list,),
-        }
-
-        # Validate that all the required fields are present.
-        for field, validation_info in required_task_data_fields.items():
-            if field in body["task_data"].keys():
-                value = body["task_data"][field]
-                
-                # Type check.
-                try:
-                    value = validation_info[0](value)
-                    body["task_data"][field] = value
-                except ValueError:
-                    return server.json_payload_response(400, {"message": f"Field {field} type in task_data must be {validation_info[0]}, instead got: {type(field)}."})
-                
-                if validation_info[0] is str:
-                    # Range check (string length).
-                    if len(value) < validation_info[1]:
-                        return server.json_payload_response(400, {"message": f"{field} must be longer than {validation_info[1]} chars."})
-                    elif len(value) > validation_info[2]:
-                        return server.json_payload_response(400, {"message": f"{field} must be shorter than {validation_info[1]} chars."})
-            else:
-                return server.json_payload_response(400, {"message": f"Missing field in task_data: {field}."})
-
-        # Validate that there are no extra fields in the task_data.
-        for field in body["task_data"].keys():
-            if field not in required_task_data_fields.keys():
-                return server.json_payload_response(400, {"message": f"Invalid field in task_data: {field}."})
-
-        # Validate that the task_type is valid.
-        if not body["task_data"]["task_type"] in ("task", "milestone"):
-            return server.json_payload_response(400, {"message": f"task_type must be one of task or milestone."})
+        error_response = _validate_task_data(server, body["task_data"])
+        if error_response is not None:
+            return error_response
 
         project_uuid = body["project_uuid"]
         # Existence check.
@@ -209,6 +229,69 @@ class TasksRoute(WebAppRoutes):
             "access_token": body["access_token"],
         })
     
+    @routes.post("/project/task/update-many")
+    async def update_many_tasks(request: web.Request) -> web.Response:
+        """
+        Update several tasks of a given project at once, e.g. all the tasks
+        whose rows are shifted when a task is moved to another row.
+
+        Args:
+            request (web.Request): The request object.
+        
+        Returns:
+            web.Response: The response object.
+                400: Invalid JSON payload.
+                410: Access token expired.
+                403: Invalid access token.
+                404: Project not found.
+                200: Success.
+        """
+        server: WebServer = request.app.app
+        body = await parse_json_request(request, ["project_uuid", "tasks_data"])
+        if isinstance(body, web.Response):
+            return body
+
+        if not isinstance(body["tasks_data"], list):
+            return server.json_payload_response(400, {"message": "tasks_data must be a list."})
+
+        for task_data in body["tasks_data"]:
+            if not isinstance(task_data, dict):
+                return server.json_payload_response(400, {"message": "Each item of tasks_data must be an object."})
+            error_response = _validate_task_data(server, task_data)
+            if error_response is not None:
+                return error_response
+
+        project_uuid = body["project_uuid"]
+        # Existence check.
+        if project_uuid == "":
+            return server.json_payload_response(400, {"message": "Project uuid cannot be empty."})
+
+        # Every task must belong to the project the user has access to,
+        # including its _id, as tasks that were deleted (e.g. restored by an
+        # undo) are inserted again.
+        for task_data in body["tasks_data"]:
+            if task_data["project_uuid"] != project_uuid or task_data["_id"] != f"{task_data['task_uuid']}:{project_uuid}":
+                return server.json_payload_response(403, {"message": "You don't have access to this project."})
+
+        project_data = await server.db.read("projects", "project_data", {"_id": project_uuid})
+        if project_data is None:
+            return server.json_payload_response(404, {"message": "Project not found."})
+        # Check if the user has access to the project.
+        if project_data["admin"] != body["username"] and body["username"] not in project_data["invitees"]:
+            return server.json_payload_response(403, {"message": "You don't have access to this project."})
+        
+        # Save all of the tasks in one write, only updating tasks that are in
+        # the project.
+        if body["tasks_data"]:
+            await server.db.update_each("projects", "tasks", [({"_id": task_data["_id"], "project_uuid": project_uuid}, task_data) for task_data in body["tasks_data"]])
+            await server.db.update("projects", "project_data", {"_id": project_uuid}, {"updated_at": datetime.now(timezone.utc).timestamp()})
+
+        return server.json_payload_response(200, {
+            "message": "Tasks updated.",
+            "tasks_data": body["tasks_data"],
+            "access_token": body["access_token"],
+        })
+
     @routes.post("/project/task/delete")
     async def delete_task(request: web.Request) -> web.Response:
         """
@@ -303,3 +386,47 @@ class TasksRoute(WebAppRoutes):
             "tasks": tasks,
             "access_token": body["access_token"],
         })
+
+    @routes.post("/project/task/fetch-previews")
+    async def fetch_task_previews(request: web.Request) -> web.Response:
+        """
+        Fetch all tasks of several projects at once, for rendering their
+        previews.
+
+        Unlike /project/task/fetch-all, this does not count as opening the
+        projects, so their updated_at is left unchanged. Projects that do not
+        exist or that the user does not have access to are left out.
+
+        Args:
+            request (web.Request): The request object.
+        
+        Returns:
+            web.Response: The response object.
+                400: Invalid JSON payload.
+                410: Access token expired.
+                403: Invalid access token.
+                200: Success.
+        """
+        server: WebServer = request.app.app
+        body = await parse_json_request(request, ["project_uuids"])
+        if isinstance(body, web.Response):
+            return body
+
+        if not isinstance(body["project_uuids"], list):
+            return server.json_payload_response(400, {"message": "Project uuids must be a list."})
+
+        # Only include the projects the user has access to.
+        tasks = {}
+        async for project_data in await server.db.read_multi("projects", "project_data", {"_id": {"$in": body["project_uuids"]}}):
+            if project_data["admin"] == body["username"] or body["username"] in project_data["invitees"]:
+                tasks[project_data["_id"]] = {}
+
+        # Collect the tasks for all of the projects in one query.
+        async for task in await server.db.read_multi("projects", "tasks", {"project_uuid": {"$in": list(tasks)}}):
+            tasks[task["project_uuid"]][task["task_uuid"]] = task
+
+        return server.json_payload_response(200, {
+            "message": "Tasks fetched.",
+            "tasks": tasks,
+            "access_token": body["access_token"],
+        })